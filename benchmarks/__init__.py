@@ -0,0 +1,10 @@
+"""
+Benchmarks for simpleconf2.
+
+Run the whole suite from the top of the repository with:
+python -m benchmarks.run
+
+See benchmarks/run.py for saving and comparing results. Some modules can also
+be run on their own for a more detailed report, for example:
+python -m benchmarks.wx_panel
+"""
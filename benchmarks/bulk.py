@@ -0,0 +1,64 @@
+"""
+Benchmark loading many independent sections at startup.
+
+Parameters are the number of sections, and the latency added to every read to
+simulate a slow (for example networked) volume. With no added latency,
+parsing and updating dominate and threads cannot help much because of the
+GIL.
+"""
+
+import atexit
+import os.path
+import shutil
+from tempfile import mkdtemp
+from time import sleep
+from attr import attrs
+from simpleconf2 import validators
+from simpleconf2.bulk import load_all
+from simpleconf2.filename import Filename
+from .schemas import make_schema, change
+
+directory = mkdtemp()
+atexit.register(shutil.rmtree, directory, True)
+params = ['100/0ms', '100/1ms', '500/0ms', '500/1ms']
+
+
+@attrs
+class SlowFilename(Filename):
+    """A filename which takes at least a millisecond to read."""
+
+    def read(self):
+        sleep(0.001)
+        return super(SlowFilename, self).read()
+
+
+def make_sections(param):
+    """Return a list of sections, each with its own file."""
+    count, latency = param.split('/')
+    cls = Filename if latency == '0ms' else SlowFilename
+    sections = []
+    for x in range(int(count)):
+        section = make_schema(
+            'Plugin', 1, 10, 10, lambda x: x, validators.Integer()
+        )(filename=cls(os.path.join(directory, '%d.json' % x)))
+        change(section)
+        section.write()
+        section.restore()
+        sections.append(section)
+    return sections
+
+
+def bench_sequential(param):
+    """Load every section with Section.load."""
+    sections = make_sections(param)
+
+    def f():
+        for section in sections:
+            section.load()
+    return f
+
+
+def bench_load_all(param):
+    """Load every section with load_all."""
+    sections = make_sections(param)
+    return lambda: load_all(sections, max_workers=8)
@@ -0,0 +1,67 @@
+"""Compare the generic Section methods with those generated by
+simpleconf2.compiler.compile_section."""
+
+from simpleconf2.compiler import compile_section
+from .schemas import definitions, make_schema, get_sections, change
+
+params = sorted(definitions)
+# Compiled copies of the schemas, so the generic ones are left alone.
+compiled = {
+    name: compile_section(make_schema(*args))
+    for name, args in definitions.items()
+}
+generic = {name: make_schema(*args) for name, args in definitions.items()}
+
+
+def prepare(schema):
+    """Return an instance of schema with every subsection instantiated and
+    every option changed, along with the data to restore it with."""
+    section = schema()
+    get_sections(section)
+    return section, change(section)
+
+
+def update(schema):
+    section, data = prepare(schema)
+    section.restore()
+    return lambda: section.update(data)
+
+
+def as_dictionary(schema):
+    section, data = prepare(schema)
+    return section.as_dictionary
+
+
+def restore(schema):
+    section, data = prepare(schema)
+    return section.restore
+
+
+def bench_update_generic(name):
+    """Apply a dictionary which changes every option."""
+    return update(generic[name])
+
+
+def bench_update_compiled(name):
+    """Apply a dictionary which changes every option."""
+    return update(compiled[name])
+
+
+def bench_as_dictionary_generic(name):
+    """Dump a section where every option has changed."""
+    return as_dictionary(generic[name])
+
+
+def bench_as_dictionary_compiled(name):
+    """Dump a section where every option has changed."""
+    return as_dictionary(compiled[name])
+
+
+def bench_restore_generic(name):
+    """Restore every option to its default."""
+    return restore(generic[name])
+
+
+def bench_restore_compiled(name):
+    """Restore every option to its default."""
+    return restore(compiled[name])
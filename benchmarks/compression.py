@@ -0,0 +1,77 @@
+"""
+Compare loading and writing compressed files with plain JSON.
+
+The large schema is used, since its options hold long lists. Compressions
+whose optional packages are not installed are left out. Run this module to
+see the size of each file as well.
+"""
+
+import atexit
+import os.path
+import shutil
+from importlib.util import find_spec
+from tempfile import mkdtemp
+from simpleconf2.filename import Filename
+from .schemas import schemas, change
+
+directory = mkdtemp()
+atexit.register(shutil.rmtree, directory, True)
+# compression: (extension, optional package) pairs.
+compressions = {
+    'none': ('', None),
+    'gzip': ('.gz', None),
+    'bz2': ('.bz2', None),
+    'lzma': ('.xz', None),
+    'zstd': ('.zst', 'zstandard'),
+    'lz4': ('.lz4', 'lz4')
+}
+params = [
+    name for name, (extension, package) in compressions.items()
+    if package is None or find_spec(package) is not None
+]
+
+
+def make_section(compression):
+    """Return an instance of the large schema with every option changed,
+    which has been written to a file compressed with compression."""
+    section = schemas['large'](
+        filename=Filename(
+            os.path.join(
+                directory, 'large.json' + compressions[compression][0]
+            ),
+            compression_level=1 if compression in ('gzip', 'zstd') else None
+        )
+    )
+    change(section)
+    section.write()
+    return section
+
+
+def bench_write(compression):
+    """Write a section where every option has changed."""
+    section = make_section(compression)
+
+    def write():
+        section._written = None  # Don't let write skip the file.
+        section.write()
+
+    return write
+
+
+def bench_load(compression):
+    """Load a file which changes every option."""
+    return make_section(compression).load
+
+
+def main():
+    for compression in params:
+        section = make_section(compression)
+        print(
+            '%-5s %9d bytes' % (
+                compression, os.path.getsize(section.filename.name)
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""Benchmarks for the Section hot paths."""
+
+import atexit
+import os.path
+import shutil
+from tempfile import mkdtemp
+from .schemas import schemas, get_sections, change
+
+directory = mkdtemp()
+atexit.register(shutil.rmtree, directory, True)
+params = sorted(schemas)
+
+
+def bench_init(name):
+    """Construct the root section."""
+    return schemas[name]
+
+
+def bench_init_all(name):
+    """Construct the root section and instantiate every subsection."""
+    return lambda: get_sections(schemas[name]())
+
+
+def bench_update(name):
+    """Apply a dictionary which changes every option."""
+    section = schemas[name]()
+    data = change(section)
+    section.restore()
+    get_sections(section)
+    return lambda: section.update(data)
+
+
+def bench_as_dictionary(name):
+    """Dump a section where every option has changed."""
+    section = schemas[name]()
+    change(section)
+    return section.as_dictionary
+
+
+def bench_write(name):
+    """Write a section where every option has changed."""
+    section = schemas[name](
+        filename=os.path.join(directory, 'write_%s.json' % name)
+    )
+    change(section)
+
+    def write():
+        section._written = None  # Don't let write skip the file.
+        section.write()
+
+    return write
+
+
+def bench_write_unchanged(name):
+    """Write a section which has already been written."""
+    section = schemas[name](
+        filename=os.path.join(directory, 'write_%s.json' % name)
+    )
+    change(section)
+    section.write()
+    return section.write
+
+
+def bench_load(name):
+    """Load a file which changes every option."""
+    filename = os.path.join(directory, 'load_%s.json' % name)
+    section = schemas[name](filename=filename)
+    change(section)
+    section.write()
+    section.restore()
+    return section.load
+
+
+def bench_load_all(name):
+    """Load a file which changes every option, then instantiate every
+    subsection."""
+    filename = os.path.join(directory, 'load_%s.json' % name)
+    section = schemas[name](filename=filename)
+    change(section)
+    section.write()
+    return lambda: get_sections(schemas[name](filename=filename))
+
+
+def bench_validate(name):
+    """Validate every option."""
+    sections = get_sections(schemas[name]())
+    return lambda: [s.validate() for s in sections]
+
+
+def bench_fingerprint(name):
+    """Change one option, then fingerprint the whole tree."""
+    section = schemas[name]()
+    change(section)
+    option = list(section.iter_options())[-1]
+    values = [option.default, option.value]
+
+    def fingerprint():
+        values.reverse()
+        option.set(values[0])
+        return section.fingerprint()
+
+    section.fingerprint()
+    return fingerprint
@@ -0,0 +1,119 @@
+"""
+Run the benchmark suite, optionally saving the results as JSON and comparing
+them with an earlier run.
+
+Every module in this package with a params attribute is a benchmark module.
+Each of its functions whose name starts with bench_ is called once per
+parameter, and must return a callable which is then timed.
+
+Usage:
+python -m benchmarks.run [-o results.json] [-c baseline.json] [-k filter]
+"""
+
+import json
+import platform
+import sys
+from argparse import ArgumentParser
+from importlib import import_module
+from pkgutil import iter_modules
+from statistics import median
+from timeit import Timer
+import simpleconf2
+
+parser = ArgumentParser(description='Run the simpleconf2 benchmarks.')
+parser.add_argument(
+    '-o', '--output', help='Save the results to this JSON file.'
+)
+parser.add_argument(
+    '-c', '--compare', help='Compare the results with this JSON file.'
+)
+parser.add_argument(
+    '-t', '--threshold', type=float, default=1.2,
+    help='Exit with an error if any benchmark is this many times slower '
+    'than in the file given to --compare (default %(default)s).'
+)
+parser.add_argument(
+    '-k', '--filter', default='',
+    help='Only run benchmarks whose names contain this string.'
+)
+parser.add_argument(
+    '-r', '--repeat', type=int, default=5,
+    help='How many times to repeat each benchmark (default %(default)s).'
+)
+
+
+def get_benchmarks(package='benchmarks'):
+    """Yield (name, function, param) triples for every benchmark."""
+    for info in sorted(
+        iter_modules(import_module(package).__path__), key=lambda i: i.name
+    ):
+        module = import_module('%s.%s' % (package, info.name))
+        params = getattr(module, 'params', None)
+        if params is None:
+            continue
+        for function_name in sorted(dir(module)):
+            if function_name.startswith('bench_'):
+                for param in params:
+                    name = '%s.%s[%s]' % (
+                        info.name, function_name[6:], param
+                    )
+                    yield name, getattr(module, function_name), param
+
+
+def measure(func, repeat):
+    """Time func, returning a dictionary of results. The number of calls per
+    repeat is chosen so each repeat takes at least 0.2 seconds."""
+    timer = Timer(func)
+    number, _ = timer.autorange()
+    times = [t / number for t in timer.repeat(repeat=repeat, number=number)]
+    return {
+        'min': min(times),
+        'median': median(times),
+        'number': number,
+        'repeat': repeat
+    }
+
+
+def main(args=None):
+    args = parser.parse_args(args)
+    results = {}
+    for name, function, param in get_benchmarks():
+        if args.filter not in name:
+            continue
+        results[name] = measure(function(param), args.repeat)
+        print('%-40s %12.3f us' % (name, results[name]['min'] * 1e6))
+    data = {
+        'machine': {
+            'python': platform.python_version(),
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'simpleconf2': simpleconf2.__version__
+        },
+        'results': results
+    }
+    if args.output is not None:
+        with open(args.output, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+    if args.compare is not None:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)['results']
+        slower = []
+        for name, result in sorted(results.items()):
+            if name not in baseline:
+                continue
+            ratio = result['min'] / baseline[name]['min']
+            print('%-40s %8.2fx' % (name, ratio))
+            if ratio > args.threshold:
+                slower.append(name)
+        if slower:
+            print(
+                '%d benchmark(s) slower than %.2fx: %s' % (
+                    len(slower), args.threshold, ', '.join(slower)
+                )
+            )
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
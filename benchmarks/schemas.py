@@ -0,0 +1,61 @@
+"""
+Synthetic schemas for the benchmarks.
+
+deep
+Ten levels of nested subsections, each with ten integer options.
+wide
+Two hundred subsections, each with ten integer options.
+large
+Ten options, each holding a list of ten thousand integers.
+flat
+One section with a thousand integer options.
+"""
+
+from simpleconf2 import Section, Option, validators
+
+
+def make_schema(name, depth, width, options, value, validator):
+    """Return a Section subclass with options options (each with the default
+    value(x) and the given validator), and width subsections to a depth of
+    depth."""
+    attributes = {}
+    for x in range(options):
+        attributes['option_%03d' % x] = Option(value(x), validator=validator)
+    if depth:
+        for x in range(width):
+            attributes['section_%03d' % x] = make_schema(
+                '%s_%d' % (name, x), depth - 1, width, options, value,
+                validator
+            )
+    return type(name, (Section,), attributes)
+
+
+# name: arguments to make_schema.
+definitions = {
+    'deep': ('Deep', 10, 1, 10, lambda x: x, validators.Integer(min=0)),
+    'wide': ('Wide', 1, 200, 10, lambda x: x, validators.Integer(min=0)),
+    'large': (
+        'Large', 0, 0, 10, lambda x: list(range(10000)),
+        validators.List(max=20000)
+    ),
+    'flat': ('Flat', 0, 0, 1000, lambda x: x, validators.Integer(min=0))
+}
+
+schemas = {name: make_schema(*args) for name, args in definitions.items()}
+
+
+def get_sections(section):
+    """Return a list of section and all its subsections, instantiating them
+    all."""
+    return list(section.iter_sections())
+
+
+def change(section):
+    """Change every option below section from its default, and return the
+    result of section.as_dictionary."""
+    for option in section.iter_options():
+        if isinstance(option.default, list):
+            option.set(option.default[::-1])
+        else:
+            option.set(option.default + 1)
+    return section.as_dictionary()
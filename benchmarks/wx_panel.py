@@ -0,0 +1,92 @@
+"""
+Benchmark the construction of the wx panels with a large section.
+
+This uses the stand-in from tests.fakewx, so it measures the work done by
+simpleconf2 and how many native windows would have been created, not the
+speed of any particular wx port.
+"""
+
+from timeit import repeat, timeit
+from tests import fakewx
+
+fakewx.install()
+
+from simpleconf2 import Section, Option, validators  # noqa: E402
+from simpleconf2.dialogs.wx import SimpleConfWxPanel, \
+     SimpleConfWxGridPanel  # noqa: E402
+
+
+def make_section(options, sections):
+    """Return a section with options options (of mixed types), and sections
+    subsections each with the same number of options."""
+    values = [
+        (True, validators.Boolean), (1, validators.Integer),
+        (1.0, validators.Float), ('text', validators.String)
+    ]
+
+    def make_class(name, depth):
+        attributes = {}
+        for x in range(options):
+            value, validator = values[x % len(values)]
+            attributes['option_%04d' % x] = Option(value, validator=validator)
+        if depth:
+            for x in range(sections):
+                attributes['section_%04d' % x] = make_class(
+                    'Section%d' % x, depth - 1
+                )
+        return type(name, (Section,), attributes)
+
+    return make_class('Config', 1)()
+
+
+params = [10, 100, 1000]
+
+
+def bench_panel(options):
+    """Construct a SimpleConfWxPanel."""
+    section = make_section(options, 20)
+    return lambda: SimpleConfWxPanel(section, None)
+
+
+def bench_grid_panel(options):
+    """Construct a SimpleConfWxGridPanel."""
+    section = make_section(options, 20)
+    return lambda: SimpleConfWxGridPanel(section, None)
+
+
+def measure(panel, section, number=5):
+    """Return (seconds per construction, windows, properties) for panel."""
+    counts = dict(fakewx.counts)
+    panel(section, None)
+    windows = fakewx.counts['windows'] - counts['windows']
+    properties = fakewx.counts['properties'] - counts['properties']
+    seconds = min(
+        repeat(lambda: panel(section, None), number=number, repeat=3)
+    ) / number
+    return seconds, windows, properties
+
+
+def main():
+    for options in (10, 100, 1000):
+        section = make_section(options, 20)
+        for panel in (SimpleConfWxPanel, SimpleConfWxGridPanel):
+            seconds, windows, properties = measure(panel, section)
+            print(
+                '%-22s %5d options: %8.3f ms, %5d windows, %5d rows' % (
+                    panel.__name__, options, seconds * 1000, windows,
+                    properties
+                )
+            )
+        p = SimpleConfWxGridPanel(section, None)
+        category = p.grid.properties['section_0000']
+        # Subsections are only built once, so this can only be timed once:
+        seconds = timeit(lambda: p.grid.Expand(category), number=1)
+        print(
+            '%-22s %5d options: %8.3f ms to expand one subsection' % (
+                '', options, seconds * 1000
+            )
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -9,11 +9,10 @@ This module aims to remove all the shortcomings of confmanager
 
 It will become the defacto configuration manager used by all my programs in the
 future.
-"""
 
-from .section import Section
-from .option import Option
-from . import exceptions, validators
+The names below are imported the first time they are used, so importing this
+package on its own is cheap.
+"""
 
 __version__ = '1.0.0'
 
@@ -24,3 +23,32 @@ __all__ = [
     'validators',
     '__version__'
 ]
+
+# name: (module, attribute) pairs for the names which are imported lazily. If
+# attribute is None, the module itself is used.
+lazy = {
+    'Section': ('section', 'Section'),
+    'Option': ('option', 'Option'),
+    'exceptions': ('exceptions', None),
+    'validators': ('validators', None)
+}
+
+
+def __getattr__(name):
+    """Import the lazy names as they are needed."""
+    try:
+        module, attribute = lazy[name]
+    except KeyError:
+        raise AttributeError(
+            'module %r has no attribute %r' % (__name__, name)
+        )
+    # The same as "from . import module", without importing importlib:
+    value = __import__(module, globals(), None, ['__name__'], 1)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(lazy))
@@ -0,0 +1,86 @@
+"""
+Load many independent sections at once.
+
+Files are read and parsed in an executor (a thread pool by default), and the
+results are applied to their sections with Section.update in the calling
+thread, as they arrive.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from . import metrics
+from .exceptions import NoFileError
+from .section import get_fingerprint
+
+
+def fetch(filename, loader):
+    """Read filename and parse its contents with loader, returning a tuple of
+    the contents, the parsed dictionary and the fingerprint of the file
+    before it was read (see Section.after_read), or None if the file does not
+    exist. This is what load_all runs in its executor."""
+    if not filename.exists():
+        return None
+    fingerprint = get_fingerprint(filename)
+    data = filename.read()
+    if getattr(filename, 'structured', False):
+        return data, data, fingerprint
+    d = loader(data)
+    if isinstance(data, memoryview):
+        data = bytes(data)  # Buffers can't be sent back from processes.
+    return data, d, fingerprint
+
+
+@metrics.instrument('bulk.load_all')
+def load_all(sections, max_workers=None, executor=None, loader=None):
+    """
+    Load every section in sections, overlapping the reading and parsing of
+    their files.
+
+    Returns a list with an entry for each section: None if it loaded
+    successfully, or the exception which stopped it from loading (NoFileError
+    if it had no filename, an OSError if its file could not be read, or
+    whatever its loader raised).
+
+    max_workers
+    The number of threads to use if executor is not given.
+    executor
+    A concurrent.futures executor to read and parse files in. If you use a
+    process pool, you must also provide loader, and the filenames of the
+    sections must be picklable.
+    loader
+    The function used to parse every file. If None, each section's loader
+    method is used.
+    """
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_workers)
+    errors = [None] * len(sections)
+    futures = []
+    try:
+        for index, section in enumerate(sections):
+            section.fix_filename()
+            if section.filename.name is None:
+                errors[index] = NoFileError()
+                continue
+            futures.append(
+                (
+                    index, executor.submit(
+                        fetch, section.filename,
+                        section.loader if loader is None else loader
+                    )
+                )
+            )
+        for index, future in futures:
+            section = sections[index]
+            try:
+                result = future.result()
+                if result is not None:
+                    data, d, fingerprint = result
+                    section.after_read(data, d, fingerprint)
+                    section.update(d)
+                section.after_load()
+            except Exception as e:
+                errors[index] = e
+    finally:
+        if own_executor:
+            executor.shutdown()
+    return errors
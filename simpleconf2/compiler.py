@@ -0,0 +1,240 @@
+"""
+Generate update, as_dictionary and restore methods specialised for the schema
+of a Section subclass.
+
+The generic methods on Section loop over dictionaries of options for every
+call. Since the options of a class are fixed when it is defined, the
+generated methods can instead read and write each option directly, compare
+values with their defaults inline, and mark the section dirty once rather
+than once per option.
+
+Compiling is opt in, and can be used as a class decorator:
+
+@compile_section
+class Config(Section):
+    ...
+
+The generated methods assume the validator of each option is not replaced
+after the class has been compiled. If you do replace one, call
+compile_section on the class again. Every instance has its own copies of the
+options, which the generated methods unpack from self._options in schema
+order.
+
+If options or subsections are added to an instance with add_option or
+add_section, that instance falls back to the generic methods.
+"""
+
+from . import metrics
+from .exceptions import NoOptionError
+from .option import Option
+from .section import Section, get_schema
+from .validators import Validator
+
+# If an update contains fewer options than this fraction of the schema, loop
+# over the update rather than looking up every option in it.
+sparse = 0.25
+
+# The condition under which a generated method hands over to the generic one.
+guard = (
+    '    if type(self) is not cls or len(self._options) != %d or '
+    'len(self._sections) != %d:'
+)
+
+
+def is_plain(option):
+    """Returns a dictionary showing which parts of option can be inlined."""
+    validator = type(option.validator)
+    return dict(
+        set=type(option).set is Option.set and
+        type(option).restore is Option.restore,
+        equal=validator.equal is Validator.equal,
+        serialise=validator.serialise is Validator.serialise,
+        deserialise=validator.deserialise is Validator.deserialise
+    )
+
+
+def unpack(options):
+    """Return the line which unpacks the options of an instance into local
+    variables, or an empty list if there are none."""
+    if not options:
+        return []
+    return [
+        '    %s, = self._options.values()' % ', '.join(
+            'o%d' % index for index in range(len(options))
+        )
+    ]
+
+
+def generate_update(options, sections):
+    """Return the source of an update method for the given list of (name,
+    plain) pairs and number of sections."""
+    lines = [
+        'def update(self, data, ignore_missing_sections=True, '
+        'ignore_missing_options=True):',
+        guard % (len(options), sections),
+        '        return Section.update(self, data, ignore_missing_sections, '
+        'ignore_missing_options)',
+        "    assert isinstance(data, dict), 'Data must be a dictionary.'"
+    ]
+    if sections:
+        lines += [
+            "    sections = data.get('sections')",
+            '    if sections:',
+            '        self.update_sections(sections, ignore_missing_sections, '
+            'ignore_missing_options)'
+        ]
+    lines += [
+        "    options = data.get('options')",
+        '    if not options:',
+        '        return',
+        '    if len(options) < %d:' % (len(options) * sparse),
+        '        for name, value in options.items():',
+        '            option = self._options.get(name)',
+        '            if option is not None:',
+        '                option.set(option.validator.deserialise(value))',
+        '            elif not ignore_missing_options:',
+        '                raise NoOptionError(name, self)',
+        '        return',
+        '    found = 0',
+        '    dirty = False'
+    ] + unpack(options)
+    for index, (name, plain) in enumerate(options):
+        option = 'o%d' % index
+        value = 'value'
+        if not plain['deserialise']:
+            value = '%s.validator.deserialise(value)' % option
+        lines += [
+            '    value = options.get(%r, missing)' % name,
+            '    if value is not missing:',
+            '        found += 1'
+        ]
+        if plain['set']:
+            lines += [
+                '        %s.value = %s' % (option, value),
+                '        dirty = True'
+            ]
+        else:
+            lines.append('        %s.set(%s)' % (option, value))
+    lines += [
+        '    if dirty:',
+        '        self.mark_dirty()',
+        '    if found != len(options) and not ignore_missing_options:',
+        '        for name in options:',
+        '            if name not in self._options:',
+        '                raise NoOptionError(name, self)'
+    ]
+    return lines
+
+
+def generate_restore(options, sections):
+    """Return the source of a restore method."""
+    lines = [
+        'def restore(self, recurse=True, shards=True):',
+        guard % (len(options), sections),
+        '        return Section.restore(self, recurse, shards)'
+    ] + unpack(options)
+    dirty = False
+    for index, (name, plain) in enumerate(options):
+        option = 'o%d' % index
+        if plain['set']:
+            lines.append('    %s.value = %s.default' % (option, option))
+            dirty = True
+        else:
+            lines.append('    %s.restore()' % option)
+    if dirty:
+        lines.append('    self.mark_dirty()')
+    if sections:
+        lines += [
+            '    if recurse:',
+            '        self.restore_sections(shards)'
+        ]
+    return lines
+
+
+def generate_as_dictionary(options, sections):
+    """Return the source of an as_dictionary method."""
+    lines = [
+        'def as_dictionary(self, full=False, shards=True):',
+        guard % (len(options), sections),
+        '        return Section.as_dictionary(self, full, shards)',
+        '    stuff = {}'
+    ]
+    if sections:
+        lines += [
+            '    sections = self.sections_as_dictionary(full, shards)',
+            '    if sections:',
+            "        stuff['sections'] = sections"
+        ]
+    lines.append('    options = {}')
+    lines += unpack(options)
+    for index, (name, plain) in enumerate(options):
+        option = 'o%d' % index
+        value = 'value'
+        if not plain['serialise']:
+            value = '%s.validator.serialise(value)' % option
+        lines.append('    value = %s.value' % option)
+        if plain['equal']:
+            lines.append(
+                '    if full or not value == %s.default:' % option
+            )
+        else:
+            lines.append('    if full or not %s.is_default():' % option)
+        lines.append('        options[%r] = %s' % (name, value))
+    lines += [
+        '    if options:',
+        "        stuff['options'] = options",
+        '    return stuff'
+    ]
+    return lines
+
+
+def compile_section(cls, recurse=True):
+    """Replace the update, as_dictionary and restore methods of cls with
+    versions generated from its schema, and return cls. Methods which cls
+    (or a class between it and Section) overrides are left alone. If recurse
+    evaluates to True, compile nested section classes too. Subclasses of a
+    compiled class fall back to the generic methods until they are compiled
+    themselves."""
+    options = []
+    sections = 0
+    namespace = dict(
+        cls=cls, Section=Section, NoOptionError=NoOptionError,
+        missing=object(), __name__=__name__
+    )
+    for name, thing in get_schema(cls):
+        if isinstance(thing, Option):
+            options.append((name, is_plain(thing)))
+        else:
+            sections += 1
+            if recurse:
+                compile_section(thing)
+    source = []
+    for name, generate in (
+        ('update', generate_update),
+        ('restore', generate_restore),
+        ('as_dictionary', generate_as_dictionary)
+    ):
+        current = getattr(cls, name)
+        if current is not getattr(Section, name) and not hasattr(
+            current, 'compiled'
+        ):
+            continue  # This method has been overridden.
+        source.extend(generate(options, sections))
+        source.append('')
+    source = '\n'.join(source)
+    exec(
+        compile(source, '<compiled %s>' % cls.__qualname__, 'exec'),
+        namespace
+    )
+    for name in ('update', 'restore', 'as_dictionary'):
+        if name not in namespace:
+            continue
+        method = namespace[name]
+        method.__qualname__ = '%s.%s' % (cls.__qualname__, name)
+        method.__doc__ = getattr(Section, name).__doc__
+        if name == 'update':
+            method = metrics.instrument('section.update')(method)
+        method.compiled = cls
+        setattr(cls, name, method)
+    cls._compiled_source = source
+    return cls
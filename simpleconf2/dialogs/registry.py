@@ -0,0 +1,64 @@
+"""
+Provides the ControlRegistry class, used by the dialogs to decide which
+control to create for each option.
+
+This module does not depend on any GUI toolkit.
+"""
+
+from attr import attrs, attrib, Factory
+
+
+@attrs
+class ControlRegistry:
+    """
+    Maps validator classes and value types to control factories.
+
+    Factories are found by walking the MRO of the class of an option's
+    validator, then the MRO of the type of its value. This means a factory
+    registered for bool is always preferred to one registered for int when
+    the value is True or False. Lookups are cached by (validator class, value
+    type), and the cache is cleared whenever a factory is registered.
+
+    validators
+    A dictionary of validator class: factory pairs.
+    types
+    A dictionary of value type: factory pairs.
+    """
+
+    validators = attrib(default=Factory(dict))
+    types = attrib(default=Factory(dict))
+    _cache = attrib(default=Factory(dict), init=False, repr=False, eq=False)
+
+    def register(self, factory, type=None, validator=None):
+        """Use factory for values of type type, or for options whose
+        validators are instances of validator. Returns factory."""
+        if type is None and validator is None:
+            raise TypeError('You must provide a type or a validator.')
+        if type is not None:
+            self.types[type] = factory
+        if validator is not None:
+            self.validators[validator] = factory
+        self._cache.clear()
+        return factory
+
+    def resolve(self, option):
+        """Return the factory which should be used for option, or None if
+        there isn't one."""
+        key = (option.validator.__class__, option.value.__class__)
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        for cls in key[0].__mro__:
+            if cls in self.validators:
+                factory = self.validators[cls]
+                break
+        else:
+            for cls in key[1].__mro__:
+                if cls in self.types:
+                    factory = self.types[cls]
+                    break
+            else:
+                factory = None
+        self._cache[key] = factory
+        return factory
@@ -4,50 +4,103 @@ This file contains the wx dialog and Panel for simpleconf.
 Any future dialogs will be kept in this directory for convenience.
 """
 
+from copy import copy
 import wx
+import wx.propgrid as wxpg
 from wx.lib.sized_controls import SizedPanel
-from wx.lib.agw.floatspin import FloatSpin
-from wx.lib.intctrl import IntCtrl
+from wx.lib.agw.floatspin import FloatSpin, EVT_FLOATSPIN
+from wx.lib.intctrl import IntCtrl, EVT_INT
 from ..validators import ValidationError
+from .registry import ControlRegistry
+
+# The controls used by SimpleConfWxPanel. Register factories here to support
+# more types of option. Factories are called as factory(option, window).
+controls = ControlRegistry()
+controls.register(lambda option, window: wx.CheckBox(window), type=bool)
+controls.register(lambda option, window: IntCtrl(window), type=int)
+controls.register(lambda option, window: wx.TextCtrl(window), type=str)
+controls.register(
+    lambda option, window: FloatSpin(window, digits=2), type=float
+)
+
+# The properties used by SimpleConfWxGridPanel. Factories are called as
+# factory(option, name), where name is the name the property should have.
+properties = ControlRegistry()
+properties.register(
+    lambda option, name: wxpg.BoolProperty(option.get_title(), name),
+    type=bool
+)
+properties.register(
+    lambda option, name: wxpg.IntProperty(option.get_title(), name), type=int
+)
+properties.register(
+    lambda option, name: wxpg.StringProperty(option.get_title(), name),
+    type=str
+)
+properties.register(
+    lambda option, name: wxpg.FloatProperty(option.get_title(), name),
+    type=float
+)
+
+
+def check_value(option, value):
+    """Validate value as if it was the value of option, without changing
+    option."""
+    staged = copy(option)
+    staged.value = value
+    staged.check()
 
 
 class SimpleConfWxPanel(SizedPanel):
     """A panel for displaying simpleconf sections."""
 
+    control_types = controls
+    # The command events which signal that the value of a control has changed.
+    # Controls which send none of these are compared with their options when
+    # OK is pressed instead:
+    change_events = [
+        wx.EVT_TEXT, wx.EVT_CHECKBOX, wx.EVT_CHOICE, wx.EVT_SPINCTRL,
+        EVT_FLOATSPIN, EVT_INT
+    ]
+
     def __init__(self, section, *args, **kwargs):
         """Construct a frame from the provided section."""
-        self.control_types = {}
-        self.control_types[bool] = lambda option, window: wx.CheckBox(window)
-        self.control_types[int] = lambda option, window: IntCtrl(window)
-        self.control_types[str] = lambda option, window: wx.TextCtrl(window)
-        self.control_types[
-            float
-        ] = lambda option, window: FloatSpin(window, digits=2)
         self.section = section
         # name:control pairs for all the controls on this form:
         self.controls = {}
+        # control ID: option pairs:
+        self.options = {}
+        # name: value pairs for the values the controls started with:
+        self.initial = {}
+        # The names of the controls which have been changed, in order:
+        self.changed = {}
         super(SimpleConfWxPanel, self).__init__(*args, **kwargs)
         self.SetSizerType('Form')
         for option in section.option_order:
             wx.StaticText(self, label=option.get_title())
             if option.control is None:
-                for type, control in self.control_types.items():
-                    if isinstance(option.value, type):
-                        c = control(option, self)
-                        break
-                else:
+                control = self.control_types.resolve(option)
+                if control is None:
                     raise TypeError(
                         'No appropriate control found for option %s with \
                         value %s.' % (
                             option.name, option.value
                         )
                     )
+                c = control(option, self)
             else:
                 c = option.control(option, self)
             if isinstance(c, (wx.CheckBox, wx.Button)):
                 c.SetLabel(option.get_title())
             c.SetValue(option.value)
+            self.initial[option.name] = c.GetValue()
             self.controls[option.name] = c
+            self.options[c.GetId()] = option
+        # Bind after setting values, so initial values aren't counted as
+        # changes. Command events propagate, so one binding per event is
+        # enough:
+        for event in self.change_events:
+            self.Bind(event, self.on_change)
         self.ok = wx.Button(self, label='&OK')
         self.ok.SetDefault()
         self.ok.Bind(wx.EVT_BUTTON, self.on_ok)
@@ -57,17 +110,163 @@ class SimpleConfWxPanel(SizedPanel):
         """Display an error message."""
         wx.MessageBox(message, title, style)
 
+    def on_change(self, event):
+        """The value of a control has changed."""
+        option = self.options.get(event.GetId())
+        if option is not None:
+            self.changed[option.name] = option
+        event.Skip()
+
+    def get_changed(self):
+        """Return a list of (name, option) pairs for the controls which have
+        changed: those which have sent one of self.change_events, in order,
+        followed by any others whose values differ from the ones they started
+        with."""
+        changed = list(self.changed.items())
+        for name, control in self.controls.items():
+            if name not in self.changed:
+                option = self.options[control.GetId()]
+                if not option.validator.equal(
+                    control.GetValue(), self.initial[name]
+                ):
+                    changed.append((name, option))
+        return changed
+
     def on_ok(self, event):
-        """The OK button was pressed."""
-        for option in self.section.option_order:
-            control = self.controls[option.name]
-            option.set(control.GetValue())
+        """The OK button was pressed. Validate the controls which have
+        changed, and only if they are all valid, set their options to the
+        values which were checked."""
+        values = []
+        for name, option in self.get_changed():
+            control = self.controls[name]
+            value = control.GetValue()
             try:
-                option.check()
+                check_value(option, value)
             except ValidationError as e:
                 self.on_error(e.message)
                 control.SetFocus()
                 return False
+            values.append((name, option, value))
+        for name, option, value in values:
+            option.set(value)
+            self.initial[name] = value
+        self.changed.clear()
+        # Signal to any overriding methods that we exited correctly:
+        return True
+
+
+class SimpleConfWxGridPanel(SizedPanel):
+    """A panel for displaying large simpleconf sections.
+
+    Options are shown as rows in a property grid, which only creates a native
+    control for the row being edited. Subsections are shown as collapsed
+    categories, and their rows are only added when they are first expanded.
+
+    Option.control is not used by this panel."""
+
+    # The string used to separate section and option names in property names:
+    separator = '/'
+    property_types = properties
+
+    def __init__(self, section, *args, **kwargs):
+        """Construct a frame from the provided section."""
+        self.section = section
+        # property name: option pairs for every row which has been added:
+        self.properties = {}
+        # category name: (section, name) pairs for unexpanded subsections:
+        self.categories = {}
+        # The names of the properties which have been changed, in order:
+        self.changed = {}
+        super(SimpleConfWxGridPanel, self).__init__(*args, **kwargs)
+        self.grid = wxpg.PropertyGrid(
+            self, style=wxpg.PG_SPLITTER_AUTO_CENTER
+        )
+        self.grid.SetSizerProps(expand=True, proportion=1)
+        self.grid.Bind(wxpg.EVT_PG_ITEM_EXPANDED, self.on_expand)
+        self.grid.Bind(wxpg.EVT_PG_CHANGED, self.on_change)
+        self.add_section(section, None, '')
+        self.ok = wx.Button(self, label='&OK')
+        self.ok.SetDefault()
+        self.ok.Bind(wx.EVT_BUTTON, self.on_ok)
+        self.cancel = wx.Button(self, label='&Cancel')
+
+    def append(self, parent, prop):
+        """Add prop to self.grid, under parent if it is not None."""
+        if parent is None:
+            return self.grid.Append(prop)
+        return self.grid.AppendIn(parent, prop)
+
+    def add_section(self, section, parent, prefix):
+        """Add rows for the options of section, and collapsed categories for
+        its subsections."""
+        for option in section.option_order:
+            name = prefix + option.name
+            factory = self.property_types.resolve(option)
+            if factory is None:
+                raise TypeError(
+                    'No appropriate property found for option %s with value '
+                    '%s.' % (option.name, option.value)
+                )
+            self.append(parent, factory(option, name))
+            if isinstance(option.value, bool):
+                self.grid.SetPropertyAttribute(name, 'UseCheckbox', True)
+            self.grid.SetPropertyValue(name, option.value)
+            self.properties[name] = option
+        for name in section.sections:
+            category_name = prefix + name
+            category = self.append(
+                parent, wxpg.PropertyCategory(name, category_name)
+            )
+            # Categories can only be expanded if they have children:
+            self.append(
+                category,
+                wxpg.StringProperty('', category_name + self.separator)
+            )
+            self.grid.Collapse(category)
+            self.categories[category_name] = (section, name)
+
+    def on_expand(self, event):
+        """Add the rows for a subsection the first time it is expanded."""
+        category = event.GetProperty()
+        category_name = category.GetName()
+        if category_name in self.categories:
+            section, name = self.categories.pop(category_name)
+            subsection = section._sections[name]
+            self.grid.DeleteProperty(category_name + self.separator)
+            category.SetLabel(subsection.title)
+            self.add_section(
+                subsection, category, category_name + self.separator
+            )
+        event.Skip()
+
+    def on_error(self, message, title='Error', style=wx.ICON_EXCLAMATION):
+        """Display an error message."""
+        wx.MessageBox(message, title, style)
+
+    def on_change(self, event):
+        """The value of a property has changed."""
+        name = event.GetPropertyName()
+        if name in self.properties:
+            self.changed[name] = self.properties[name]
+        event.Skip()
+
+    def on_ok(self, event):
+        """The OK button was pressed. Validate the properties which have
+        changed, and only if they are all valid, set their options (in the
+        section and its subsections) to the values which were checked."""
+        values = []
+        for name, option in self.changed.items():
+            value = self.grid.GetPropertyValue(name)
+            try:
+                check_value(option, value)
+            except ValidationError as e:
+                self.on_error(e.message)
+                self.grid.SelectProperty(name, focus=True)
+                return False
+            values.append((option, value))
+        for option, value in values:
+            option.set(value)
+        self.changed.clear()
         # Signal to any overriding methods that we exited correctly:
         return True
 
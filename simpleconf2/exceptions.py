@@ -41,3 +41,21 @@ class NoOptionError(DataMissingError):
 
 class NoFileError(SimpleConfError):
     """No file was provided."""
+
+
+class ReadOnlyError(SimpleConfError):
+    """%s is read only."""
+    def __init__(self, filename):
+        return super(ReadOnlyError, self).__init__(self.__doc__ % filename)
+
+
+class NoHistoryError(SimpleConfError):
+    """History is not enabled for this section."""
+
+
+class NoVersionError(DataMissingError):
+    """No version %s in history %s."""
+    def __init__(self, version, history):
+        return super(NoVersionError, self).__init__(
+            self.__doc__ % (version, history)
+        )
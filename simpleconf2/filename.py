@@ -1,8 +1,122 @@
 """Provides the Filename class. This should be used when setting
 Section.filename."""
 
+import os
 import os.path
+from mmap import mmap, ACCESS_READ
+from time import perf_counter
 from attr import attrs, attrib, Factory
+from . import metrics
+
+# extension: compression pairs, used when Filename.compression is None.
+extensions = {
+    '.gz': 'gzip',
+    '.bz2': 'bz2',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+    '.zst': 'zstd',
+    '.lz4': 'lz4'
+}
+
+
+def open_compressed(name, mode, compression, level=None):
+    """Return a file object which compresses or decompresses the file name
+    as it is written or read, so the uncompressed contents are never held in
+    memory alongside the compressed ones. compression should be one of the
+    values in extensions, and level is passed on to the compressor (if it is
+    not None). zstd needs the zstandard package, and lz4 needs lz4."""
+    if 'b' not in mode and 't' not in mode:
+        mode += 't'
+    if mode[0] not in 'wax':
+        level = None  # Only compressors take levels.
+    kwargs = {}
+    if compression in ('gzip', 'bz2'):
+        if compression == 'gzip':
+            import gzip as module
+        else:
+            import bz2 as module
+        if level is not None:
+            kwargs['compresslevel'] = level
+        return module.open(name, mode, **kwargs)
+    elif compression == 'lzma':
+        import lzma
+        if level is not None:
+            kwargs['preset'] = level
+        return lzma.open(name, mode, **kwargs)
+    elif compression == 'zstd':
+        try:
+            import zstandard
+        except ImportError:
+            raise ImportError('zstd compression needs the zstandard package.')
+        if level is not None:
+            kwargs['cctx'] = zstandard.ZstdCompressor(level=level)
+        return zstandard.open(name, mode, **kwargs)
+    elif compression == 'lz4':
+        try:
+            import lz4.frame
+        except ImportError:
+            raise ImportError('lz4 compression needs the lz4 package.')
+        if level is not None:
+            kwargs['compression_level'] = level
+        return lz4.frame.open(name, mode, **kwargs)
+    raise ValueError('Unknown compression %r.' % compression)
+
+
+def get_size(result, args):
+    """Return the number of bytes Filename.read or Filename.write (called with
+    args, and returning result) read or wrote, for metrics.instrument. This
+    is the size of the file on disk, so compressed files count their
+    compressed size. For file-like objects, it is the length of the data
+    encoded as UTF-8."""
+    filename = args[0]
+    if not filename.file_like:
+        return os.path.getsize(filename.name)
+    data = result if len(args) == 1 else args[1]
+    if isinstance(data, str):
+        data = data.encode()
+    return len(data)
+
+
+@attrs
+class FileLock:
+    """
+    An exclusive advisory lock (taken with fcntl.flock) on the file name,
+    which is created if necessary. Use it as a context manager.
+
+    If a metrics sink is installed, the time the lock was held is recorded as
+    filename.lock, and whenever someone else held the lock first, the time
+    spent waiting for it is recorded as filename.lock_wait.
+    """
+
+    name = attrib()
+    _fd = attrib(default=Factory(lambda: None), init=False, repr=False)
+    _acquired = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def __enter__(self):
+        import fcntl
+        self._fd = os.open(self.name, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                started = perf_counter()
+                fcntl.flock(self._fd, fcntl.LOCK_EX)
+                if metrics.sink is not None:
+                    metrics.sink.observe(
+                        'filename.lock_wait', perf_counter() - started
+                    )
+        except BaseException:
+            os.close(self._fd)
+            raise
+        self._acquired = perf_counter()
+        return self
+
+    def __exit__(self, *args):
+        os.close(self._fd)  # Releases the lock.
+        if metrics.sink is not None:
+            metrics.sink.observe(
+                'filename.lock', perf_counter() - self._acquired
+            )
 
 
 @attrs
@@ -18,32 +132,127 @@ class Filename:
     The flags used when opening the file for writing.
     file_like
     A boolean value specifying whether or not name is a file-like object.
+    use_mmap
+    If True, read returns a read-only memoryview of a memory-mapped copy of
+    the file instead of a string. The default Section.loader copies it to
+    bytes before parsing, so it is fastest with loaders which accept buffers
+    (orjson.loads for example). The file is only remapped when its
+    fingerprint changes.
+    compression
+    The compression to use (one of the values in extensions). If None, it is
+    chosen from the extension of name, so config.json.gz is read and written
+    with gzip. Set it to False to disable compression entirely. Compressed
+    files are never memory-mapped.
+    compression_level
+    The level to compress with, or None to use the library's default.
     """
 
+    # If True, read returns a dictionary and write expects one, so
+    # Section.loader and Section.dumper are not used.
+    structured = False
+
     name = attrib()
     read_flags = attrib(default=Factory(lambda: 'r'))
     write_flags = attrib(default=Factory(lambda: 'w'))
     file_like = attrib(default=Factory(bool))
+    use_mmap = attrib(default=Factory(bool))
+    compression = attrib(default=Factory(lambda: None))
+    compression_level = attrib(default=Factory(lambda: None))
+    _mmap = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+    _mmap_fingerprint = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+
+    def fingerprint(self):
+        """Return a tuple which changes whenever the file on disk changes, or
+        None if the file does not exist."""
+        try:
+            s = os.stat(self.name)
+        except OSError:
+            return None
+        return (s.st_ino, s.st_size, s.st_mtime_ns)
 
+    @metrics.instrument('filename.read', get_size)
     def read(self):
         """Load the file and return its contents."""
         if self.file_like:
             data = self.name.read()
             self.name.seek(0)  # We might need to read again.
             return data
+        compression = self.get_compression()
+        if compression:
+            with open_compressed(
+                self.name, self.read_flags, compression
+            ) as f:
+                return f.read()
+        elif self.use_mmap:
+            return self.read_buffer()
         else:
             with open(self.name, self.read_flags) as f:
                 return f.read()
 
+    def read_buffer(self):
+        """Return the contents of the file as a read-only memoryview, mapping
+        the file into memory if it has changed since it was last mapped."""
+        fingerprint = self.fingerprint()
+        if fingerprint is None or fingerprint != self._mmap_fingerprint:
+            with open(self.name, 'rb') as f:
+                if os.fstat(f.fileno()).st_size:
+                    m = mmap(f.fileno(), 0, access=ACCESS_READ)
+                    self._mmap = memoryview(m)
+                else:
+                    self._mmap = memoryview(b'')  # Can't map empty files.
+            self._mmap_fingerprint = fingerprint
+        return self._mmap
+
+    def close(self):
+        """Forget any memory-mapped copy of the file. The mapping itself is
+        freed once any buffers returned by read_buffer are no longer
+        referenced."""
+        self._mmap = None
+        self._mmap_fingerprint = None
+
+    @metrics.instrument('filename.write', get_size)
     def write(self, data):
         """Write data to this file. You should provide data in the form
         expected by the resulting file-like object."""
         if self.file_like:
             return self.name.write(data)
+        compression = self.get_compression()
+        if compression:
+            with open_compressed(
+                self.name, self.write_flags, compression,
+                level=self.compression_level
+            ) as f:
+                return f.write(data)
+        elif self.use_mmap:
+            # Replace rather than truncate the file so existing mappings keep
+            # pointing at the old (unchanged) contents.
+            tmp = '%s.%d.tmp' % (self.name, os.getpid())
+            with open(tmp, self.write_flags) as f:
+                res = f.write(data)
+            os.replace(tmp, self.name)
+            return res
         else:
             with open(self.name, self.write_flags) as f:
                 return f.write(data)
 
+    def get_compression(self):
+        """Return the compression used for this file, or None if it is not
+        compressed."""
+        if self.compression is None:
+            if isinstance(self.name, (str, os.PathLike)):
+                return extensions.get(os.path.splitext(self.name)[1])
+            return None
+        return self.compression or None
+
+    def lock(self):
+        """Return a FileLock for self.name + '.lock', so processes can take
+        turns to read and write this file."""
+        return FileLock(self.name + '.lock')
+
     def exists(self):
         """Returns True if sef.filename is a file or self.file_like is True,
         False otherwise."""
@@ -0,0 +1,51 @@
+"""
+Hashes of section contents, used by Section.fingerprint.
+
+A section's fingerprint covers every option which differs from its default,
+and the fingerprints of any subsections with such options, so two sections
+have the same fingerprint if as_dictionary would return the same data for
+both. Subsections which have not been instantiated are hashed from the data
+which is waiting for them.
+"""
+
+import json
+from hashlib import blake2b
+from .section import get_data
+
+
+def encode(value):
+    """Return value as canonical JSON bytes."""
+    return json.dumps(
+        value, sort_keys=True, separators=(',', ':'), default=repr
+    ).encode()
+
+
+def digest(options, sections):
+    """Return the fingerprint for a section with the given dictionary of
+    name: serialised value pairs for changed options, and list of (name,
+    fingerprint) pairs for changed subsections."""
+    h = blake2b(encode(options), digest_size=16)
+    for name, fingerprint in sorted(sections):
+        h.update(b'%s\0%s' % (name.encode(), fingerprint))
+    return h.digest()
+
+
+# The fingerprint of a section where nothing has changed.
+empty = digest({}, [])
+
+
+def hash_dictionary(data):
+    """Return the fingerprint of a section whose as_dictionary method returned
+    data."""
+    return digest(
+        data.get('options', {}), [
+            (name, hash_dictionary(child))
+            for name, child in data.get('sections', {}).items()
+        ]
+    )
+
+
+def hash_data(cls, data):
+    """Return the fingerprint an instance of the Section subclass cls would
+    have after being updated with data."""
+    return hash_dictionary(get_data(cls, data))
@@ -0,0 +1,141 @@
+"""Provides the History class, an append-only log of the versions of a
+section.
+
+Each line of the log is a version number, a kind (c for a full checkpoint or
+d for a delta against the previous version), and a JSON payload. Only the
+headers are parsed when indexing the log, and reconstructing a version only
+reads from the nearest checkpoint before it.
+"""
+
+import os
+from json import loads, dumps
+from attr import attrs, attrib, Factory
+from .exceptions import NoVersionError
+from .utils import flatten, expand, diff, patch
+
+
+@attrs
+class History:
+    """
+    The version history of a section.
+
+    name
+    The filename of the log.
+    checkpoint_interval
+    How many versions to write between full checkpoints.
+    keep
+    The minimum number of versions to keep when compacting the log.
+    """
+
+    name = attrib()
+    checkpoint_interval = attrib(default=Factory(lambda: 20))
+    keep = attrib(default=Factory(lambda: 100))
+    # (version, offset, checkpoint) triples, one per line of the log:
+    _index = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+    _state = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+
+    def index(self):
+        """Return the index of the log, scanning it if necessary."""
+        if self._index is None:
+            self._index = []
+            if os.path.isfile(self.name):
+                offset = 0
+                with open(self.name, 'rb') as f:
+                    for line in f:
+                        version, kind, _ = line.split(b' ', 2)
+                        self._index.append(
+                            (int(version), offset, kind == b'c')
+                        )
+                        offset += len(line)
+        return self._index
+
+    def versions(self):
+        """Return a list of the versions which can be reconstructed."""
+        return [version for version, offset, checkpoint in self.index()]
+
+    def latest(self):
+        """Return the most recent version, or None if nothing has been
+        recorded."""
+        index = self.index()
+        return index[-1][0] if index else None
+
+    def get_flat(self, version):
+        """Return the flattened data for version."""
+        index = self.index()
+        if not index or not index[0][0] <= version <= index[-1][0]:
+            raise NoVersionError(version, self.name)
+        # Versions are consecutive, so this is the line for version:
+        position = version - index[0][0]
+        start = position
+        while not index[start][2]:
+            start -= 1
+        flat = {}
+        with open(self.name, 'rb') as f:
+            f.seek(index[start][1])
+            for _ in range(position - start + 1):
+                _, kind, payload = f.readline().split(b' ', 2)
+                if kind == b'c':
+                    flat = loads(payload)
+                else:
+                    patch(flat, *loads(payload))
+        return flat
+
+    def at(self, version):
+        """Return the data recorded as version, in the form returned by
+        Section.as_dictionary."""
+        return expand(self.get_flat(version))
+
+    def record(self, data):
+        """Record data (as returned by Section.as_dictionary) as a new version
+        if it differs from the latest one. Return the latest version."""
+        flat = flatten(data)
+        index = self.index()
+        latest = self.latest()
+        if self._state is None:
+            self._state = {} if latest is None else self.get_flat(latest)
+        if latest is not None and flat == self._state:
+            return latest
+        version = 1 if latest is None else latest + 1
+        checkpoint = latest is None or version - next(
+            v for v, offset, c in reversed(index) if c
+        ) >= self.checkpoint_interval
+        if checkpoint:
+            line = '%d c %s\n' % (version, dumps(flat))
+        else:
+            line = '%d d %s\n' % (version, dumps(diff(self._state, flat)))
+        with open(self.name, 'ab') as f:
+            offset = f.tell()
+            f.write(line.encode())
+        index.append((version, offset, checkpoint))
+        self._state = flat
+        if index[0][0] < version - self.keep - self.checkpoint_interval:
+            self.compact()
+        return version
+
+    def compact(self):
+        """Drop everything before the newest checkpoint which still leaves at
+        least self.keep versions in the log."""
+        index = self.index()
+        if not index:
+            return
+        oldest = index[-1][0] - self.keep + 1
+        start = None
+        for position, (version, offset, checkpoint) in enumerate(index):
+            if version > oldest:
+                break
+            if checkpoint:
+                start = position
+        if not start:
+            return  # Nothing to drop.
+        offset = index[start][1]
+        tmp = '%s.%d.tmp' % (self.name, os.getpid())
+        with open(self.name, 'rb') as f, open(tmp, 'wb') as g:
+            f.seek(offset)
+            for chunk in iter(lambda: f.read(65536), b''):
+                g.write(chunk)
+        os.replace(tmp, self.name)
+        self._index = [(v, o - offset, c) for v, o, c in index[start:]]
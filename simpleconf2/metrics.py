@@ -0,0 +1,194 @@
+"""
+Optional instrumentation for loading, writing, updating and validating
+sections.
+
+Nothing is recorded until a sink is installed with set_sink, and until then
+the instrumented methods only pay for checking whether there is one. Sinks
+should provide the methods of Sink. Three are provided:
+
+Registry
+Keeps counts and totals in memory.
+PrometheusRegistry
+A Registry which can render its contents in the Prometheus text format.
+LoggingSink
+Logs every event.
+
+Events are named after the instrumented methods (section.load, section.write,
+section.update, section.validate, section.merge, filename.read,
+filename.write and filename.fetch). FileLock also records filename.lock (the
+time a lock was held) and filename.lock_wait (the time spent waiting for a
+lock someone else held). Calls made while an event of the same name is
+already being timed in the same thread (updating subsections for example)
+are included in the outer call rather than recorded again. Calls which raise
+exceptions are not recorded.
+"""
+
+import threading
+from functools import wraps
+from time import perf_counter
+from attr import attrs, attrib, Factory
+
+sink = None
+local = threading.local()
+
+
+def set_sink(new):
+    """Start sending events to new (or stop recording if new is None).
+    Returns the previous sink."""
+    global sink
+    old = sink
+    sink = new
+    return old
+
+
+def instrument(event, size=None):
+    """Decorate a function so calls to it are sent to the sink as event. If
+    size is given, it is called with the result and arguments of each call and
+    should return the number of bytes which were read or written."""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if sink is None:
+                return func(*args, **kwargs)
+            active = local.__dict__.setdefault('active', set())
+            if event in active:
+                return func(*args, **kwargs)
+            active.add(event)
+            started = perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            finally:
+                active.discard(event)
+            if sink is not None:
+                sink.observe(
+                    event, perf_counter() - started,
+                    None if size is None else size(result, args)
+                )
+            return result
+        return wrapper
+    return decorator
+
+
+class Sink:
+    """The methods every sink must provide."""
+
+    def observe(self, event, duration, size=None):
+        """Called when event took duration seconds. If any bytes were read or
+        written, size is how many."""
+        raise NotImplementedError
+
+    def failure(self, path, message):
+        """Called when the option at the dotted path path fails
+        validation."""
+        raise NotImplementedError
+
+
+@attrs
+class Registry(Sink):
+    """
+    Keep totals for every event in memory.
+
+    counts
+    A dictionary of event: number of calls pairs.
+    durations
+    A dictionary of event: total seconds pairs.
+    sizes
+    A dictionary of event: total bytes pairs.
+    failures
+    A dictionary of option path: number of validation failures pairs.
+    """
+
+    counts = attrib(default=Factory(dict))
+    durations = attrib(default=Factory(dict))
+    sizes = attrib(default=Factory(dict))
+    failures = attrib(default=Factory(dict))
+    lock = attrib(
+        default=Factory(threading.Lock), init=False, repr=False, eq=False
+    )
+
+    def observe(self, event, duration, size=None):
+        with self.lock:
+            self.counts[event] = self.counts.get(event, 0) + 1
+            self.durations[event] = self.durations.get(event, 0.0) + duration
+            if size is not None:
+                self.sizes[event] = self.sizes.get(event, 0) + size
+
+    def failure(self, path, message):
+        with self.lock:
+            self.failures[path] = self.failures.get(path, 0) + 1
+
+    def clear(self):
+        """Forget everything."""
+        with self.lock:
+            self.counts.clear()
+            self.durations.clear()
+            self.sizes.clear()
+            self.failures.clear()
+
+
+def escape(value):
+    """Escape value for use as a Prometheus label value."""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n'
+    )
+
+
+@attrs
+class PrometheusRegistry(Registry):
+    """A Registry which can be rendered in the Prometheus text format."""
+
+    prefix = attrib(default=Factory(lambda: 'simpleconf2'))
+
+    def render(self):
+        """Return the contents of this registry as a string."""
+        lines = []
+        with self.lock:
+            for name, label, values in (
+                ('calls_total', 'event', self.counts),
+                ('seconds_total', 'event', self.durations),
+                ('bytes_total', 'event', self.sizes),
+                ('validation_failures_total', 'path', self.failures)
+            ):
+                name = '%s_%s' % (self.prefix, name)
+                lines.append('# TYPE %s counter' % name)
+                for key, value in sorted(values.items()):
+                    lines.append(
+                        '%s{%s="%s"} %r' % (name, label, escape(key), value)
+                    )
+        return '\n'.join(lines) + '\n'
+
+
+def get_logger(name):
+    """Return the logger called name. The logging module is only imported if
+    it is needed."""
+    import logging
+    return logging.getLogger(name)
+
+
+@attrs
+class LoggingSink(Sink):
+    """
+    Log every event.
+
+    logger
+    The logger to use.
+    level
+    The level to log events at. Validation failures are logged as warnings.
+    """
+
+    logger = attrib(default=Factory(lambda: get_logger(__name__)))
+    level = attrib(default=Factory(lambda: 10))  # logging.DEBUG.
+
+    def observe(self, event, duration, size=None):
+        if size is None:
+            self.logger.log(
+                self.level, '%s took %.3f ms.', event, duration * 1000
+            )
+        else:
+            self.logger.log(
+                self.level, '%s took %.3f ms (%d bytes).', event,
+                duration * 1000, size
+            )
+
+    def failure(self, path, message):
+        self.logger.warning('%s failed validation: %s', path, message)
@@ -38,14 +38,27 @@ class Option:
     def set(self, value):
         """Set self.value = value."""
         self.value = value
+        if self.section is not None:
+            self.section.mark_dirty()
+
+    def copy(self):
+        """Return a shallow copy of this option. Sections copy every option
+        defined on their class, so this skips the overhead of copy.copy."""
+        option = object.__new__(type(self))
+        option.__dict__.update(self.__dict__)
+        return option
 
     def check(self):
         """Validate the value of this option."""
-        return self.validator.validate(self)
+        return self.validator.check(self)
+
+    def is_default(self):
+        """Returns True if value is the same as default."""
+        return self.validator.equal(self.value, self.default)
 
     def restore(self):
         """Return value to default."""
-        self.value = self.default
+        self.set(self.default)
 
     def get_title(self):
         """Return the title of this option."""
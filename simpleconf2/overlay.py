@@ -0,0 +1,185 @@
+"""
+Provides the Overlay class, returned by Section.overlay.
+
+An overlay is a copy-on-write view of a section: options are read from the
+section until they are overridden, and only the overridden values are
+stored. Creating an overlay does not copy anything, so they are cheap enough
+to create for every request (for per-tenant settings for example).
+"""
+
+from copy import copy
+from attr import attrs, attrib, Factory
+from .exceptions import NoOptionError, NoSectionError, ValidationError
+
+# Attributes of the base section which are the same for its overlays.
+forwarded = frozenset(['title', 'visible', 'is_shard'])
+
+
+@attrs
+class Overlay:
+    """
+    A view of base (a Section or another Overlay) which reads through to it,
+    and stores any options which are set locally.
+
+    Subsections are available as attributes, and are overlays of the
+    corresponding subsections of base, created when first accessed. Only the
+    attributes in forwarded are read from base. Everything else (including
+    options, and methods such as load and write) raises AttributeError, so
+    options should be read and set by subscripting.
+    """
+
+    base = attrib()
+    _values = attrib(default=Factory(dict), init=False, repr=False)
+    _overlays = attrib(
+        default=Factory(dict), init=False, repr=False, eq=False
+    )
+
+    @property
+    def _options(self):
+        return self.base._options
+
+    @property
+    def options(self):
+        """Return a view of the names of base's options."""
+        return self.base.options
+
+    @property
+    def sections(self):
+        """Return a view of the names of base's subsections."""
+        return self.base.sections
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        if name in self.base.sections:
+            if name not in self._overlays:
+                self._overlays[name] = Overlay(getattr(self.base, name))
+            return self._overlays[name]
+        if name in forwarded:
+            return getattr(self.base, name)
+        raise AttributeError(
+            'Overlays have no attribute %r. Options are read and set by '
+            'subscripting, and overlays cannot be loaded or written.' % name
+        )
+
+    def __getitem__(self, option):
+        """Get an option by subscripting, from this overlay if it has been
+        overridden, or base otherwise."""
+        try:
+            return self._values[option]
+        except KeyError:
+            return self.base[option]
+
+    def __setitem__(self, option, value):
+        """Override option with value, leaving base alone."""
+        if option not in self._options:
+            raise NoOptionError(option, self)
+        self._values[option] = value
+
+    def __str__(self):
+        return str(self.base)
+
+    def get(self, option, default=None):
+        """Get a config option."""
+        try:
+            return self[option]
+        except NoOptionError:
+            return default
+
+    def fingerprint(self):
+        """Return the fingerprint base would have if the overridden options
+        had been set on it (see Section.fingerprint)."""
+        if not self.has_overrides():
+            return self.base.fingerprint()
+        from .fingerprint import hash_dictionary
+        return hash_dictionary(self.as_dictionary())
+
+    def overlay(self):
+        """Return an overlay of this overlay."""
+        return Overlay(self)
+
+    def is_overridden(self, option):
+        """Returns True if option has been set on this overlay."""
+        return option in self._values
+
+    def has_overrides(self):
+        """Returns True if any options have been set on this overlay or the
+        overlays of its subsections."""
+        return bool(self._values) or any(
+            child.has_overrides() for child in self._overlays.values()
+        )
+
+    def restore(self, recurse=True):
+        """Forget every overridden option, so everything is read from base
+        again. If recurse evaluates to True, do the same for subsections."""
+        self._values.clear()
+        if recurse:
+            for child in self._overlays.values():
+                child.restore()
+
+    def update(
+        self, data, ignore_missing_sections=True, ignore_missing_options=True
+    ):
+        """Override options with the values in data, as Section.update
+        does."""
+        assert isinstance(data, dict), 'Data must be a dictionary.'
+        for key, value in data.get('sections', {}).items():
+            if key in self.base.sections:
+                getattr(self, key).update(
+                    value, ignore_missing_sections=ignore_missing_sections,
+                    ignore_missing_options=ignore_missing_options
+                )
+            elif not ignore_missing_sections:
+                raise NoSectionError(key, self)
+        for key, value in data.get('options', {}).items():
+            option = self._options.get(key)
+            if option is not None:
+                self._values[key] = option.validator.deserialise(value)
+            elif not ignore_missing_options:
+                raise NoOptionError(key, self)
+
+    def as_dictionary(self, full=False, shards=True):
+        """Return the data base.as_dictionary would return if the overridden
+        options had been set on it."""
+        return self.apply(self.base.as_dictionary(full, shards), full, shards)
+
+    def apply(self, data, full=False, shards=True):
+        """Apply the overrides from this overlay and its subsections to data
+        (as returned by base.as_dictionary), and return the result."""
+        options = dict(data.get('options', {}))
+        for name, value in self._values.items():
+            option = self._options[name]
+            if full or not option.validator.equal(value, option.default):
+                options[name] = option.validator.serialise(value)
+            else:
+                options.pop(name, None)
+        sections = dict(data.get('sections', {}))
+        for name, child in self._overlays.items():
+            if not child.has_overrides() or (
+                not shards and self.base.is_shard(name)
+            ):
+                continue
+            section = child.apply(sections.get(name, {}), full, shards)
+            if section or full:
+                sections[name] = section
+            else:
+                sections.pop(name, None)
+        stuff = {}
+        if sections:
+            stuff['sections'] = sections
+        if options:
+            stuff['options'] = options
+        return stuff
+
+    def validate(self):
+        """Return a dictionary of name: reason pairs for the overridden
+        options on this overlay which fail validation."""
+        errors = {}
+        for name, value in self._values.items():
+            option = copy(self._options[name])
+            option.value = value
+            try:
+                option.check()
+            except ValidationError as e:
+                errors[name] = e.message
+        return errors
@@ -0,0 +1,269 @@
+"""
+Find out which options are actually used.
+
+While a Profiler is running, it counts reads of options (through
+Section.__getitem__, Section.get and attribute access), writes (through
+Section.__setitem__ and Option.set), and attribute accesses of subsections.
+Only accesses made from outside simpleconf2 are counted, so loading,
+updating and writing sections doesn't count as using them.
+
+Profiling works by replacing those methods, so it costs nothing until it is
+started, but slows every attribute access on sections while it runs. Only
+one profiler can run at a time.
+
+with Profiler() as profiler:
+    run_the_application()
+print(profiler.report(config).format())
+"""
+
+import sys
+from attr import attrs, attrib, Factory
+from .option import Option
+from .section import Section, get_schema
+
+# The profiler which is running, if any.
+active = None
+
+
+def is_external():
+    """Returns True if the method which called the caller of this function
+    is outside simpleconf2."""
+    name = sys._getframe(2).f_globals.get('__name__', '')
+    return name != 'simpleconf2' and not name.startswith('simpleconf2.')
+
+
+def get_paths(section, prefix=''):
+    """Return a tuple of lists of the dotted paths of every option and every
+    subsection below section, without instantiating any deferred
+    subsections."""
+    options = []
+    sections = []
+    if isinstance(section, Section):
+        names = section._options
+        children = [
+            (name, section._sections.loaded.get(name) or
+             section._sections.deferred[name])
+            for name in section._sections
+        ]
+    else:  # A class which has not been instantiated.
+        schema = get_schema(section)
+        names = [name for name, thing in schema if isinstance(thing, Option)]
+        children = [
+            (name, thing) for name, thing in schema
+            if not isinstance(thing, Option)
+        ]
+    for name in names:
+        options.append(prefix + name)
+    for name, child in children:
+        sections.append(prefix + name)
+        child_options, child_sections = get_paths(child, prefix + name + '.')
+        options.extend(child_options)
+        sections.extend(child_sections)
+    return options, sections
+
+
+@attrs
+class Report:
+    """
+    The results of profiling a section.
+
+    options
+    A dictionary of path: (reads, writes) pairs for every option.
+    sections
+    A dictionary of path: accesses pairs for every subsection, where
+    accesses counts the times the subsection was accessed as an attribute,
+    and options below it were read or written.
+    """
+
+    options = attrib()
+    sections = attrib()
+
+    def get_touched(self):
+        """Return a list of (path, reads, writes) tuples for the options which
+        have been read or written, most used first."""
+        touched = [
+            (path, reads, writes)
+            for path, (reads, writes) in self.options.items()
+            if reads or writes
+        ]
+        touched.sort(key=lambda item: (-(item[1] + item[2]), item[0]))
+        return touched
+
+    def hot(self, count=10):
+        """Return the count most used options, as (path, reads, writes)
+        tuples."""
+        return self.get_touched()[:count]
+
+    def cold(self, count=10):
+        """Return the count least used options which have been used at all,
+        as (path, reads, writes) tuples, least used first."""
+        return self.get_touched()[::-1][:count]
+
+    def untouched(self):
+        """Return a sorted list of the paths of options which have never been
+        read or written."""
+        return sorted(
+            path for path, counts in self.options.items() if not any(counts)
+        )
+
+    def untouched_sections(self):
+        """Return a sorted list of the paths of subsections which have never
+        been accessed."""
+        return sorted(
+            path for path, accesses in self.sections.items() if not accesses
+        )
+
+    def format(self, count=10):
+        """Return the report as text, listing count hot and cold options."""
+        lines = ['Hot options:']
+        for path, reads, writes in self.hot(count):
+            lines.append('%8d reads %8d writes  %s' % (reads, writes, path))
+        lines.append('Cold options:')
+        for path, reads, writes in self.cold(count):
+            lines.append('%8d reads %8d writes  %s' % (reads, writes, path))
+        lines.append('Untouched options:')
+        lines.extend('  ' + path for path in self.untouched())
+        lines.append('Untouched sections:')
+        lines.extend('  ' + path for path in self.untouched_sections())
+        return '\n'.join(lines)
+
+
+@attrs
+class Profiler:
+    """
+    Count accesses of options and sections while running.
+
+    Counts are kept in dictionaries of (id(section), name): count pairs, and
+    sections holds every section which has been counted, by id.
+    """
+
+    reads = attrib(default=Factory(dict), init=False)
+    writes = attrib(default=Factory(dict), init=False)
+    accesses = attrib(default=Factory(dict), init=False)
+    sections = attrib(default=Factory(dict), init=False, repr=False)
+    _originals = attrib(default=Factory(dict), init=False, repr=False)
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def count(self, counts, section, name):
+        """Add one to the count for section and name in counts."""
+        key = (id(section), name)
+        counts[key] = counts.get(key, 0) + 1
+        self.sections[key[0]] = section
+
+    def start(self):
+        """Start counting, and return self."""
+        global active
+        if active is not None:
+            raise RuntimeError('Another profiler is already running.')
+        active = self
+        originals = self._originals
+        for cls, name in (
+            (Section, '__getattribute__'), (Section, '__getitem__'),
+            (Section, '__setitem__'), (Section, 'get'), (Option, 'set')
+        ):
+            # None if the method is inherited, and should be deleted again.
+            originals[(cls, name)] = cls.__dict__.get(name)
+        getattribute = Section.__getattribute__
+        getitem = Section.__getitem__
+        setitem = Section.__setitem__
+        get = Section.get
+        set_value = Option.set
+        profiler = self
+
+        def section_getattribute(section, name):
+            value = getattribute(section, name)
+            if name[0] != '_' and isinstance(
+                value, (Option, Section)
+            ) and is_external():
+                if getattribute(section, '_options').get(name) is value:
+                    profiler.count(profiler.reads, section, name)
+                elif name in getattribute(section, '_sections'):
+                    profiler.count(profiler.accesses, section, name)
+            return value
+
+        def section_getitem(section, option):
+            if is_external():
+                profiler.count(profiler.reads, section, option)
+            return getitem(section, option)
+
+        def section_setitem(section, option, value):
+            if is_external():
+                profiler.count(profiler.writes, section, option)
+            return setitem(section, option, value)
+
+        def section_get(section, option, default=None):
+            if is_external():
+                profiler.count(profiler.reads, section, option)
+            return get(section, option, default=default)
+
+        def option_set(option, value):
+            if option.section is not None and is_external():
+                profiler.count(profiler.writes, option.section, option.name)
+            return set_value(option, value)
+
+        Section.__getattribute__ = section_getattribute
+        Section.__getitem__ = section_getitem
+        Section.__setitem__ = section_setitem
+        Section.get = section_get
+        Option.set = option_set
+        return self
+
+    def stop(self):
+        """Stop counting, putting back the methods which were replaced."""
+        global active
+        for (cls, name), method in self._originals.items():
+            if method is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, method)
+        self._originals.clear()
+        if active is self:
+            active = None
+
+    def clear(self):
+        """Forget all counts."""
+        self.reads.clear()
+        self.writes.clear()
+        self.accesses.clear()
+        self.sections.clear()
+
+    def get_counts(self, counts, root):
+        """Return the counts in counts for sections below root as a
+        dictionary of dotted path: count pairs."""
+        paths = {}
+        for (section, name), count in counts.items():
+            section = self.sections[section]
+            top = section
+            while top.parent is not None:
+                top = top.parent
+            if top is root:
+                path = section.get_path(name)
+                paths[path] = paths.get(path, 0) + count
+        return paths
+
+    def report(self, section):
+        """Return a Report for section (which should be a root section) and
+        everything below it."""
+        option_paths, section_paths = get_paths(section)
+        reads = self.get_counts(self.reads, section)
+        writes = self.get_counts(self.writes, section)
+        options = {
+            path: (reads.get(path, 0), writes.get(path, 0))
+            for path in option_paths
+        }
+        sections = dict.fromkeys(section_paths, 0)
+        for path, accesses in self.get_counts(
+            self.accesses, section
+        ).items():
+            if path in sections:
+                sections[path] += accesses
+        for path, (read, written) in options.items():
+            names = path.split('.')[:-1]
+            for index in range(1, len(names) + 1):
+                sections['.'.join(names[:index])] += read + written
+        return Report(options, sections)
@@ -0,0 +1,173 @@
+"""
+Provides the RemoteFilename class, for loading sections from HTTP servers.
+
+The response is saved to a local file (the name of the filename), along with
+a sidecar file (name + '.meta') holding its ETag and Last-Modified headers,
+so later fetches can be conditional. If the server can't be reached, the
+saved copy is used.
+"""
+
+import json
+import os
+import time
+from http.client import HTTPConnection, HTTPSConnection, HTTPException
+from urllib.parse import urlsplit
+from attr import attrs, attrib, Factory
+from . import metrics
+from .exceptions import ReadOnlyError
+from .filename import Filename
+
+
+@attrs
+class RemoteFilename(Filename):
+    """
+    A copy of a file on an HTTP server, which can be used as
+    Section.filename. Remote files are read only.
+
+    name
+    Where to keep the local copy.
+    url
+    The http:// or https:// URL to fetch.
+    max_age
+    How many seconds the local copy can be used for without asking the
+    server whether it has changed.
+    timeout
+    How many seconds to wait for the server.
+    headers
+    Extra headers to send with every request.
+
+    After each check, error holds the exception which stopped the server
+    being reached (if the local copy was used instead), or None.
+    """
+
+    url = attrib(kw_only=True)
+    max_age = attrib(default=Factory(lambda: 0), kw_only=True)
+    timeout = attrib(default=Factory(lambda: 10.0), kw_only=True)
+    headers = attrib(default=Factory(dict), kw_only=True)
+    error = attrib(default=Factory(lambda: None), init=False, eq=False)
+    _connection = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+    # True if exists has checked the server, so read doesn't need to:
+    _checked = attrib(
+        default=Factory(bool), init=False, repr=False, eq=False
+    )
+
+    def get_meta(self):
+        """Return the contents of the sidecar file as a dictionary."""
+        try:
+            with open(self.name + '.meta', 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def set_meta(self, meta):
+        """Save meta to the sidecar file."""
+        with open(self.name + '.meta', 'w') as f:
+            json.dump(meta, f)
+
+    def connect(self):
+        """Return a (possibly reused) connection to the server."""
+        if self._connection is None:
+            url = urlsplit(self.url)
+            if url.scheme == 'https':
+                cls = HTTPSConnection
+            else:
+                cls = HTTPConnection
+            self._connection = cls(url.netloc, timeout=self.timeout)
+        return self._connection
+
+    def close(self):
+        """Close the connection to the server."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        super(RemoteFilename, self).close()
+
+    def request(self, headers):
+        """Send a GET request with headers, returning (status, headers,
+        body). If a reused connection has been closed by the server, try
+        again with a new one."""
+        url = urlsplit(self.url)
+        path = url.path or '/'
+        if url.query:
+            path += '?' + url.query
+        for attempt in (1, 2):
+            connection = self.connect()
+            try:
+                connection.request('GET', path, headers=headers)
+                response = connection.getresponse()
+                return response.status, response.headers, response.read()
+            except (OSError, HTTPException) as e:
+                connection.close()
+                self._connection = None
+                if attempt == 2 or not isinstance(
+                    e, (ConnectionResetError, BrokenPipeError)
+                ):
+                    raise
+
+    @metrics.instrument('filename.fetch')
+    def fetch(self):
+        """Make a conditional request for the file, saving it locally if it
+        has changed. Returns True if a new copy was saved."""
+        meta = self.get_meta()
+        headers = dict(self.headers)
+        if os.path.isfile(self.name):
+            if 'etag' in meta:
+                headers['If-None-Match'] = meta['etag']
+            if 'last_modified' in meta:
+                headers['If-Modified-Since'] = meta['last_modified']
+        status, response_headers, body = self.request(headers)
+        if status == 304:
+            meta['checked'] = time.time()
+            self.set_meta(meta)
+            return False
+        elif status != 200:
+            raise OSError('%s returned %d.' % (self.url, status))
+        tmp = '%s.%d.tmp' % (self.name, os.getpid())
+        with open(tmp, 'wb') as f:
+            f.write(body)
+        os.replace(tmp, self.name)
+        meta = dict(checked=time.time())
+        for key, header in (
+            ('etag', 'ETag'), ('last_modified', 'Last-Modified')
+        ):
+            if header in response_headers:
+                meta[key] = response_headers[header]
+        self.set_meta(meta)
+        return True
+
+    def check(self):
+        """Fetch the file if the local copy is older than self.max_age,
+        falling back to the local copy (and setting self.error) if the server
+        can't be reached and there is one."""
+        self.error = None
+        checked = self.get_meta().get('checked')
+        if checked is not None and os.path.isfile(
+            self.name
+        ) and time.time() - checked < self.max_age:
+            return
+        try:
+            self.fetch()
+        except (OSError, HTTPException) as e:
+            if not os.path.isfile(self.name):
+                raise
+            self.error = e
+
+    def exists(self):
+        """Check the server, then return True if there is a local copy."""
+        self.check()
+        self._checked = True
+        return super(RemoteFilename, self).exists()
+
+    def read(self):
+        """Return the contents of the local copy, checking the server first
+        unless self.exists has just done so."""
+        if not self._checked:
+            self.check()
+        self._checked = False
+        return super(RemoteFilename, self).read()
+
+    def write(self, data):
+        """Raises ReadOnlyError, since remote files can't be written."""
+        raise ReadOnlyError(self.url)
@@ -2,14 +2,170 @@
 This file contains the section class.
 """
 
+import os.path
+from collections.abc import MutableMapping
 from inspect import isclass
-from json import loads, dumps
 from attr import attrs
+from . import metrics
 from .option import Option
 from .exceptions import NoSectionError, NoOptionError, NoFileError, \
-     ValidationError
+     ValidationError, NoHistoryError
 from .filename import Filename
 
+_missing = object()
+# Files modified less than this many nanoseconds ago may be modified again
+# without their fingerprints changing, since timestamps are not that precise.
+racy = 2 * 10 ** 9
+
+
+def merge(first, second):
+    """Return a copy of the section data first, with the section data second
+    merged on top of it."""
+    options = dict(first.get('options', {}))
+    options.update(second.get('options', {}))
+    sections = dict(first.get('sections', {}))
+    for name, data in second.get('sections', {}).items():
+        sections[name] = merge(sections.get(name, {}), data)
+    stuff = {}
+    if sections:
+        stuff['sections'] = sections
+    if options:
+        stuff['options'] = options
+    return stuff
+
+
+class LazySection:
+    """Replaces a nested Section subclass on its owner, so that subsections
+    are only instantiated when they are first accessed. Accessing the
+    attribute on the class itself still returns the nested class."""
+
+    def __init__(self, name, cls):
+        self.name = name
+        self.cls = cls
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self.cls
+        return instance._sections[self.name]
+
+
+class SectionMap(MutableMapping):
+    """A mapping of name: section pairs. Nested Section classes which have
+    been deferred are instantiated the first time they are looked up."""
+
+    def __init__(self, section):
+        self.section = section
+        self.order = {}  # Names in the order they were added.
+        self.loaded = {}
+        self.deferred = {}  # name: class pairs.
+
+    def defer(self, name, cls):
+        """Instantiate cls as the subsection name when it is first needed."""
+        self.order[name] = None
+        self.deferred[name] = cls
+
+    def is_loaded(self, name):
+        """Returns True if the subsection name has been instantiated."""
+        return name in self.loaded
+
+    def __getitem__(self, name):
+        try:
+            return self.loaded[name]
+        except KeyError:
+            if name not in self.deferred:
+                raise
+        thing = self.deferred[name](
+            parent=self.section, filename=self.section.get_shard_filename(name)
+        )
+        self.section.add_section(name, thing)
+        return thing
+
+    def __setitem__(self, name, thing):
+        self.order[name] = None
+        self.deferred.pop(name, None)
+        self.loaded[name] = thing
+
+    def __delitem__(self, name):
+        del self.order[name]
+        self.loaded.pop(name, None)
+        self.deferred.pop(name, None)
+
+    def __contains__(self, name):
+        return name in self.order
+
+    def __iter__(self):
+        return iter(self.order)
+
+    def __len__(self):
+        return len(self.order)
+
+
+def get_fingerprint(filename):
+    """Return filename.fingerprint(), or None if filename has no fingerprint
+    method. Fingerprints are taken before reading, so a file which changes
+    while it is being read will not match its fingerprint later."""
+    if hasattr(filename, 'fingerprint'):
+        return filename.fingerprint()
+
+
+def check_option(option):
+    """Return the message from validating option, or None if it is valid."""
+    try:
+        option.check()
+    except ValidationError as e:
+        return e.message
+
+
+def get_schema(cls):
+    """Return a list of (name, thing) pairs for every option and nested
+    section class on cls. The result is cached on cls, and nested sections
+    are replaced with LazySection instances along the way."""
+    if '_schema' in cls.__dict__:
+        return cls._schema
+    schema = []
+    for name in dir(cls):
+        if name.startswith('_'):
+            continue  # Don't want to mess with __class__.
+        thing = getattr(cls, name)
+        if isinstance(thing, Option):
+            schema.append((name, thing))
+        elif isclass(thing) and issubclass(thing, Section):
+            for owner in cls.__mro__:
+                if owner.__dict__.get(name) is thing:
+                    setattr(owner, name, LazySection(name, thing))
+                    break
+            schema.append((name, thing))
+    cls._schema = schema
+    return schema
+
+
+def get_data(cls, data):
+    """Return the data an instance of the Section subclass cls would return
+    from as_dictionary after being updated with data, leaving out options and
+    subsections which cls does not have, and options with their default
+    values."""
+    options = {}
+    sections = {}
+    values = data.get('options', {})
+    children = data.get('sections', {})
+    for name, thing in get_schema(cls):
+        if isinstance(thing, Option):
+            if name in values:
+                validator = thing.validator
+                value = validator.deserialise(values[name])
+                if not validator.equal(value, thing.default):
+                    options[name] = validator.serialise(value)
+        elif name in children:
+            child = get_data(thing, children[name])
+            if child:
+                sections[name] = child
+    stuff = {}
+    if sections:
+        stuff['sections'] = sections
+    if options:
+        stuff['options'] = options
+    return stuff
+
 
 @attrs(init=False)
 class Section:
@@ -25,6 +181,29 @@ class Section:
     Section.load) and return a dictionary.
     dumper should expect a dictionary (and any optional arguments passed to
     Section.dump) and return a string.
+
+    Subsections with filenames of their own are stored in those files rather
+    than in this section's file (they are shards). If shard_directory is set,
+    every nested subsection without a filename is stored in that directory, as
+    name + shard_extension. Writing only rewrites shards which have changed,
+    and shards are only loaded when they are first accessed.
+
+    If canonical is True, the default dumper sorts keys and leaves out
+    whitespace, so the same data is always written as the same bytes. Either
+    way, self.write does not touch the file if the bytes it would write are
+    the same as those last read from or written to it, and the file has not
+    been changed since.
+
+    If locking is True, writes take an advisory lock on self.filename (see
+    Filename.lock), so several processes can share a file. If the file has
+    changed since this section last read or wrote it, it is read again, and
+    only the options this section has changed since then are merged into it.
+    The section is then updated with whatever the other processes wrote.
+
+    If history is set, every write is recorded in a History log, so earlier
+    versions can be retrieved with self.at and restored with self.rollback.
+    History can be True (to log to self.filename.name + '.history'), a
+    filename, or an instance of History.
     """
 
     option_order = []
@@ -32,21 +211,91 @@ class Section:
     parent = None
     title = 'Untitled Section'
     visible = True  # Use this to hide system configuration.
+    shard_directory = None
+    shard_extension = '.json'
+    history = None
+    canonical = False
+    locking = False
+    parallel_cost = 10
+    _name = None  # The name this section has on its parent.
 
     @property
     def sections(self):
-        """Return the children of this section as a list of strings."""
-        return list(self._sections.keys())
+        """Return a view of the names of this section's children."""
+        return self._sections.keys()
 
     @property
     def children(self):
-        """Return the section objects that make up this section's children."""
-        return list(self._sections.values())
+        """Return a view of the section objects that make up this section's
+        children. Deferred subsections are instantiated as they are reached."""
+        return self._sections.values()
 
     @property
     def options(self):
-        """Return options as a list of names."""
-        return list(self._options.keys())
+        """Return a view of the names of this section's options."""
+        return self._options.keys()
+
+    def is_visible(self):
+        """Returns True if this section and all its parents are visible."""
+        section = self
+        while section is not None:
+            if not section.visible:
+                return False
+            section = section.parent
+        return True
+
+    def iter_tree(self, visible=None, prefix='', shown=None):
+        """Yield (prefix, section) pairs for this section and every section
+        below it, depth first, where prefix is the dotted path to the section
+        (starting with prefix, and ending with a dot unless it is empty).
+
+        visible - Unless it is None, only yield sections whose visibility is
+        equal to this. Sections are only visible if their parents are too, so
+        when this is True, hidden sections are not descended into (or
+        instantiated).
+        shown - The visibility of this section, worked out with
+        self.is_visible if it is None."""
+        if shown is None:
+            shown = self.is_visible()
+        if visible is None or shown == visible:
+            yield prefix, self
+        if visible and not shown:
+            return
+        for name in self._sections:
+            child = shown and self.get_attribute(name).visible
+            if visible and not child:
+                continue
+            yield from self._sections[name].iter_tree(
+                visible=visible, prefix=prefix + name + '.', shown=child
+            )
+
+    def iter_sections(self, visible=None):
+        """Yield this section and every section below it, depth first,
+        filtered as with self.iter_tree."""
+        for prefix, section in self.iter_tree(visible=visible):
+            yield section
+
+    def walk(self, visible=None, validator=None, prefix=''):
+        """Yield (path, option) pairs for every option in this section and
+        the sections below it, depth first. Paths are dotted, as with
+        utils.flatten, and start with prefix.
+
+        visible - Only include options from sections whose visibility is
+        equal to this (see self.iter_tree), unless it is None.
+        validator - Only include options whose validators are instances of
+        this class (or tuple of classes), unless it is None."""
+        for path, section in self.iter_tree(visible=visible, prefix=prefix):
+            for name, option in section._options.items():
+                if validator is None or isinstance(
+                    option.validator, validator
+                ):
+                    yield path + name, option
+
+    def iter_options(self, visible=None, validator=None):
+        """Yield every option in this section and the sections below it,
+        filtered as with self.walk."""
+        for path, option in self.walk(visible=visible, validator=validator):
+            yield option
 
     def __init__(
         self, filename=None, parent=None, title=None, load=True, **kwargs
@@ -63,7 +312,9 @@ class Section:
         own load and write methods, or else override fix_filename to use a
         class better suited to your needs.
         Just ensure this new class has read and write methods as well as a name
-        attribute.
+        attribute. If the class has a true structured attribute, its read and
+        write methods will deal in dictionaries, and self.loader and
+        self.dumper will not be used (see sqlite.SQLiteFilename).
         parent - The parent of this section.
         title - The friendly name of this section (will be used as the window
         title).
@@ -76,23 +327,37 @@ class Section:
             self.parent = parent
         if title is not None:
             self.title = title
-        self._sections = {}  # a dictionary of name: section pairs.
+        self._sections = SectionMap(self)
+        # Data loaded for subsections which have not been instantiated yet:
+        self._section_data = {}
         self._options = {}
+        self._dirty = False
+        self._fingerprint = None
+        # The (hash, Filename.fingerprint()) pair for the contents of
+        # self.filename when it was last read or written:
+        self._written = None
+        # The data this section last read or wrote, if self.locking is True:
+        self._base = None
+        # Options hold their values, so every instance needs its own copies
+        # of the options defined on its class. They come from the class, so
+        # the checks in self.add_option can be skipped.
+        copies = {}
+        for name, thing in get_schema(type(self)):
+            if isinstance(thing, Option):
+                option = thing.copy()
+                option.section = self
+                option.name = name
+                self._options[name] = option
+                setattr(self, name, option)
+                copies[id(thing)] = option
+            else:
+                self._sections.defer(name, thing)
         if self.option_order:
-            option_order = self.option_order
+            option_order = [
+                copies.get(id(option), option) for option in self.option_order
+            ]
         else:  # The user didn't specify an order. Infer.
-            option_order = []
-        for name in dir(self):
-            if name.startswith('_'):
-                continue  # Don't want to mess with __class__.
-            thing = getattr(self, name)
-            if isinstance(thing, Option):
-                self.add_option(name, thing)
-                if not self.option_order:
-                    option_order.append(thing)
-            elif isclass(thing) and issubclass(thing, Section):
-                thing = thing(parent=self)
-                self.add_section(name, thing)
+            option_order = list(copies.values())
         self.option_order = option_order
         if load:
             try:
@@ -100,19 +365,41 @@ class Section:
             except NoFileError:
                 pass  # There is no filename.
 
-    def loader(self, *args, **kwargs):
+    def loader(self, data, *args, **kwargs):
         """Should expect the string resulting from reading self.filename, and
         return a dictionary. By default we use json.dumps, but you can override
-        this method to use any loader or dumper you want."""
-        return loads(*args, **kwargs)
+        this method to use any loader or dumper you want. Buffers (as read
+        when self.filename.use_mmap is True) are copied to bytes first, since
+        json.loads cannot parse them."""
+        from json import loads
+        if isinstance(data, memoryview):
+            data = bytes(data)
+        return loads(data, *args, **kwargs)
 
     def dumper(self, *args, **kwargs):
         """Should expect a dictionary as returned by self.as_dictionary and
         return a string suitable for writing to self.filename. By default we
         use json.dumps, but you can override this method to use any system you
         like."""
+        from json import dumps
+        if self.canonical:
+            kwargs.setdefault('sort_keys', True)
+            kwargs.setdefault('separators', (',', ':'))
         return dumps(*args, **kwargs)
 
+    def hash_contents(self, data):
+        """Return a hash of data, which has been read from or will be written
+        to self.filename, or None if self.filename cannot tell when the file
+        has been changed by someone else."""
+        if getattr(self.filename, 'structured', False) or getattr(
+            self.filename, 'file_like', False
+        ) or not hasattr(self.filename, 'fingerprint'):
+            return None
+        if isinstance(data, str):
+            data = data.encode()
+        from hashlib import blake2b
+        return blake2b(data, digest_size=16).digest()
+
     def add_option(self, name, thing, include=False):
         """Add thing as an option named name of this section. If include is
         True, add thing to option_order as well."""
@@ -122,21 +409,10 @@ class Section:
                     name, thing
                 )
             )
-        if hasattr(
-            self, name
-        ) and not (
-            getattr(
-                self, name
-            ) is thing or (
-                isclass(
-                    getattr(
-                        self, name
-                    )
-                ) and isinstance(
-                    thing, getattr(
-                        self, name
-                    )
-                )
+        existing = self.get_attribute(name)
+        if existing is not _missing and not (
+            existing is thing or (
+                isclass(existing) and isinstance(thing, existing)
             )
         ):
             raise AttributeError(
@@ -147,6 +423,7 @@ class Section:
         thing.section = self
         thing.name = name
         self._options[name] = thing
+        self.forget_fingerprint()
         setattr(self, name, thing)
         if include:
             self.option_order.append(thing)
@@ -159,21 +436,10 @@ class Section:
                     name, thing
                 )
             )
-        if hasattr(
-            self, name
-        ) and not (
-            getattr(
-                self, name
-            ) is thing or (
-                isclass(
-                    getattr(
-                        self, name
-                    )
-                ) and isinstance(
-                    thing, getattr(
-                        self, name
-                    )
-                )
+        existing = self.get_attribute(name)
+        if existing is not _missing and not (
+            existing is thing or (
+                isclass(existing) and isinstance(thing, existing)
             )
         ):
             raise AttributeError(
@@ -181,69 +447,289 @@ class Section:
                     name, self
                 )
             )
+        thing.parent = self
+        thing._name = name
         self._sections[name] = thing
+        self.forget_fingerprint()
         setattr(self, name, thing)
+        if name in self._section_data:
+            thing.update(self._section_data.pop(name))
+
+    def get_attribute(self, name):
+        """Return the attribute name without instantiating any deferred
+        subsection, or a sentinel if there is no such attribute."""
+        if name in self._sections.deferred:
+            return self._sections.deferred[name]
+        return getattr(self, name, _missing)
 
     def fix_filename(self):
         """Ensures self.filename is an instance of Filename."""
         if not isinstance(self.filename, Filename):
             self.filename = Filename(self.filename)
 
+    def get_path(self, name=None):
+        """Return the dotted path to this section from the root section. If
+        name is given, it is added to the end."""
+        names = [] if name is None else [name]
+        section = self
+        while section.parent is not None:
+            names.append(section._name)
+            section = section.parent
+        return '.'.join(reversed(names))
+
+    def get_shard_filename(self, name):
+        """Return the filename the deferred subsection name should be created
+        with, or None if it should use its own."""
+        if self.shard_directory is None or self._sections.deferred[
+            name
+        ].filename is not None:
+            return None
+        return os.path.join(self.shard_directory, name + self.shard_extension)
+
+    def is_shard(self, name):
+        """Returns True if the subsection name is stored in its own file."""
+        if name in self._sections.deferred:
+            if self.shard_directory is not None:
+                return True
+            thing = self._sections.deferred[name]
+        else:
+            thing = self._sections.loaded[name]
+        return getattr(thing.filename, 'name', thing.filename) is not None
+
+    def get_shards(self, dirty=False):
+        """Yield every instantiated shard stored below this section. If dirty
+        evaluates to True, only yield shards which have changed since they
+        were last loaded or written."""
+        for name, section in self._sections.loaded.items():
+            if dirty and not section._dirty:
+                continue
+            if self.is_shard(name):
+                yield section
+            else:
+                yield from section.get_shards(dirty=dirty)
+
+    def mark_dirty(self):
+        """Mark this section and all its parents as changed, and forget their
+        fingerprints. Stops at the first section which is already marked and
+        has no fingerprint, as its parents must be too."""
+        section = self
+        while section is not None and (
+            not section._dirty or section._fingerprint is not None
+        ):
+            section._dirty = True
+            section._fingerprint = None
+            section = section.parent
+
+    def forget_fingerprint(self):
+        """Forget the fingerprints of this section and all its parents."""
+        section = self
+        while section is not None and section._fingerprint is not None:
+            section._fingerprint = None
+            section = section.parent
+
+    def fingerprint(self):
+        """Return a hash (as bytes) of every option in this section and the
+        sections below it which differs from its default. It is cached until
+        an option below this section is changed with Option.set, so checking
+        an unchanged tree is cheap. Sections with the same fingerprint would
+        return the same data from self.as_dictionary."""
+        if self._fingerprint is None:
+            from .fingerprint import digest, empty
+            options = self.options_as_dictionary()
+            sections = []
+            for name in self._sections:
+                fingerprint = self.get_section_fingerprint(name)
+                if fingerprint != empty:
+                    sections.append((name, fingerprint))
+            self._fingerprint = digest(options, sections)
+        return self._fingerprint
+
+    def get_section_fingerprint(self, name):
+        """Return the fingerprint of the subsection name, without
+        instantiating it unless it is a shard."""
+        if self._sections.is_loaded(name) or self.is_shard(name):
+            return self._sections[name].fingerprint()
+        from .fingerprint import hash_data
+        return hash_data(
+            self._sections.deferred[name], self._section_data.get(name, {})
+        )
+
+    def diff(self, other, prefix=''):
+        """Return a sorted list of the dotted paths (starting with prefix) of
+        options whose values differ between this section and other. Only
+        subsections whose fingerprints differ are compared."""
+        if self.fingerprint() == other.fingerprint():
+            return []
+        from .utils import flatten
+        paths = set()
+        ours = self.options_as_dictionary()
+        theirs = other.options_as_dictionary()
+        for name in set(ours) | set(theirs):
+            if ours.get(name, _missing) != theirs.get(name, _missing):
+                paths.add(prefix + name)
+        for name in set(self._sections) | set(other._sections):
+            path = prefix + name + '.'
+            if name not in other._sections or name not in self._sections:
+                section = self if name in self._sections else other
+                paths.update(
+                    flatten(section._sections[name].as_dictionary(), path)
+                )
+            elif self.get_section_fingerprint(
+                name
+            ) != other.get_section_fingerprint(name):
+                paths.update(
+                    self._sections[name].diff(other._sections[name], path)
+                )
+        return sorted(paths)
+
+    def mark_clean(self):
+        """Mark this section and any subsections stored in the same file as
+        unchanged."""
+        self._dirty = False
+        for name, section in self._sections.loaded.items():
+            if not self.is_shard(name):
+                section.mark_clean()
+
+    def overlay(self):
+        """Return an Overlay of this section, which reads options from this
+        section until they are overridden, storing only the overridden
+        values."""
+        from .overlay import Overlay
+        return Overlay(self)
+
+    def fix_history(self):
+        """Ensures self.history is an instance of History. Raises
+        NoHistoryError if history is not enabled."""
+        if not self.history:
+            raise NoHistoryError()
+        from .history import History
+        if self.history is True:
+            self.fix_filename()
+            self.history = History(self.filename.name + '.history')
+        elif not isinstance(self.history, History):
+            self.history = History(self.history)
+
+    def at(self, version):
+        """Return the data written to self.filename as version, in the form
+        returned by self.as_dictionary."""
+        self.fix_history()
+        return self.history.at(version)
+
+    def rollback(self, version):
+        """Return this section to how it was when version was written. Shards
+        are left alone, and nothing is written to disk."""
+        data = self.at(version)
+        self.restore(shards=False)
+        self.update(data)
+
+    @metrics.instrument('section.load')
     def load(self, *args, **kwargs):
-        """Load configuration from disk."""
+        """Load configuration from disk, reloading any shards which have
+        already been instantiated."""
         self.fix_filename()
         if self.filename.name is None:
             raise NoFileError()  # Don't try and load anything.
         if self.filename.exists():
+            fingerprint = get_fingerprint(self.filename)
             data = self.filename.read()
-        else:
-            return  # Nothing to do.
-        d = self.loader(data, *args, **kwargs)
-        self.update(d)
+            if getattr(self.filename, 'structured', False):
+                d = data
+            else:
+                d = self.loader(data, *args, **kwargs)
+            self.after_read(data, d, fingerprint)
+            self.update(d)
+        self.after_load(*args, **kwargs)
+
+    def after_read(self, data, d, fingerprint):
+        """Called with the contents read from self.filename (data), the
+        dictionary loaded from them (d), and the fingerprint self.filename had
+        before it was read, before self is updated with d. Remembers them, so
+        self.write can skip unchanged files and merge locked ones."""
+        contents = self.hash_contents(data)
+        if contents is not None:
+            self._written = (contents, fingerprint)
+        if self.locking:
+            self._base = d
+
+    def after_load(self, *args, **kwargs):
+        """Called once data from self.filename has been applied with
+        self.update. Reloads any shards which have already been instantiated,
+        passing them args and kwargs, then marks this section as clean."""
+        for section in list(self.get_shards()):
+            section.load(*args, **kwargs)
+        self.mark_clean()
 
+    @metrics.instrument('section.update')
     def update(
         self, data, ignore_missing_sections=True, ignore_missing_options=True
     ):
         """Update self from data. If ignore_missing_* evaluates to True don't
         raise an error when missing sections or options are found."""
         assert isinstance(data, dict), 'Data must be a dictionary.'
-        for key, value in data.get('sections', {}).items():
-            if key in self.sections:
+        self.update_sections(
+            data.get('sections', {}), ignore_missing_sections,
+            ignore_missing_options
+        )
+        for key, value in data.get('options', {}).items():
+            option = self._options.get(key)
+            if option is None:
+                if not ignore_missing_options:
+                    raise NoOptionError(key, self)
+            elif option.validator.plain:
+                option.set(value)
+            else:
+                option.set(option.validator.deserialise(value))
+
+    def update_sections(
+        self, sections, ignore_missing_sections=True,
+        ignore_missing_options=True
+    ):
+        """Update subsections from sections, a dictionary of name: data
+        pairs, as self.update does."""
+        for key, value in sections.items():
+            if key in self._sections:
+                if not self._sections.is_loaded(key) and (
+                    ignore_missing_sections and ignore_missing_options
+                ):
+                    # Hold on to the data until the section is needed.
+                    self._section_data[key] = merge(
+                        self._section_data.get(key, {}), value
+                    )
+                    self.forget_fingerprint()
+                    continue
                 self._sections[key].update(
                     value, ignore_missing_sections=ignore_missing_sections,
                     ignore_missing_options=ignore_missing_options
                 )
             else:
                 if not ignore_missing_sections:
-                    raise NoSectionError((key, self))
-        for key, value in data.get('options', {}).items():
-            try:
-                self[key] = value
-            except NoOptionError as e:
-                if not ignore_missing_options:
-                    raise e
+                    raise NoSectionError(key, self)
 
-    def restore(self, recurse=True):
+    def restore(self, recurse=True, shards=True):
         """Restore this section to defaults. If recursive evaluates to True,
-        restore all children."""
+        restore all children. If shards evaluates to False, leave subsections
+        stored in their own files alone."""
         for o in self._options.values():
             o.restore()
         if recurse:
-            for s in self.children:
-                s.restore(True)
+            self.restore_sections(shards)
 
-    def as_dictionary(self, full=False):
+    def restore_sections(self, shards=True):
+        """Restore all subsections to defaults, as self.restore does."""
+        if self._section_data:
+            self._section_data.clear()
+            self.forget_fingerprint()
+        for name, s in self._sections.loaded.items():
+            if shards or not self.is_shard(name):
+                s.restore(True, shards=shards)
+
+    def as_dictionary(self, full=False, shards=True):
         """Return this section as a dictionary If full evaluates to True,
-        dump everything, not just anything that has changed."""
-        sections = {}
-        options = {}
-        for name, section in self._sections.items():
-            data = section.as_dictionary()
-            if data or full:
-                sections[name] = data
-        for name, option in self._options.items():
-            if option.value != option.default or full:
-                options[name] = option.value
+        dump everything, not just anything that has changed. If shards
+        evaluates to False, leave out subsections stored in their own
+        files."""
+        sections = self.sections_as_dictionary(full, shards)
+        options = self.options_as_dictionary(full)
         stuff = {}
         if sections:
             stuff['sections'] = sections
@@ -251,14 +737,121 @@ class Section:
             stuff['options'] = options
         return stuff
 
+    def options_as_dictionary(self, full=False):
+        """Return a dictionary of name: serialised value pairs for options,
+        as self.as_dictionary does."""
+        options = {}
+        for name, option in self._options.items():
+            if option.validator.plain:
+                if full or not option.value == option.default:
+                    options[name] = option.value
+            elif full or not option.is_default():
+                options[name] = option.validator.serialise(option.value)
+        return options
+
+    def sections_as_dictionary(self, full=False, shards=True):
+        """Return a dictionary of name: data pairs for subsections, as
+        self.as_dictionary does."""
+        sections = {}
+        for name in self._sections:
+            shard = self.is_shard(name)
+            if shard and not shards:
+                continue
+            if shard or self._sections.is_loaded(name):
+                data = self._sections[name].as_dictionary(shards=shards)
+            else:  # Use the loaded data without instantiating the section.
+                data = get_data(
+                    self._sections.deferred[name],
+                    self._section_data.get(name, {})
+                )
+            if data or full:
+                sections[name] = data
+        return sections
+
+    @metrics.instrument('section.write')
     def write(self, *args, **kwargs):
-        """Write this section to disk if filename is provided. Pass all args
-        and kwargs to self.dumper."""
+        """Write this section to disk if filename is provided, along with any
+        shards which have changed. Pass all args and kwargs to
+        self.dumper. Returns True if any file was written, or False if they
+        were all unchanged."""
         self.fix_filename()
         if self.filename.name is None:
             raise NoFileError()
-        data = self.dumper(self.as_dictionary(), *args, **kwargs)
+        d = self.as_dictionary(shards=False)
+        if self.locking and not getattr(
+            self.filename, 'structured', False
+        ) and not getattr(self.filename, 'file_like', False):
+            with self.filename.lock():
+                merged = None
+                if self.filename.exists() and not self.is_unchanged():
+                    merged = self.merge_file(d)
+                written = self.write_data(
+                    d if merged is None else merged, *args, **kwargs
+                )
+            if merged is not None:  # Catch up with the other writers.
+                self.restore(shards=False)
+                self.update(merged)
+                d = merged
+            self._base = d
+        else:
+            written = self.write_data(d, *args, **kwargs)
+        if written and self.history:
+            self.fix_history()
+            self.history.record(d)
+        for section in list(self.get_shards(dirty=True)):
+            if section.write(*args, **kwargs):
+                written = True
+        self.mark_clean()
+        return written
+
+    def write_data(self, d, *args, **kwargs):
+        """Write d (as returned by self.as_dictionary) to self.filename,
+        passing args and kwargs to self.dumper. Returns False if the file
+        already held the same data, and was not written, True otherwise."""
+        if getattr(self.filename, 'structured', False):
+            data = d
+        else:
+            data = self.dumper(d, *args, **kwargs)
+        contents = self.hash_contents(data)
+        if contents is not None and self._written is not None and (
+            contents == self._written[0] and self.is_unchanged()
+        ):
+            return False
         self.filename.write(data)
+        if contents is not None:
+            self._written = (contents, self.filename.fingerprint())
+        return True
+
+    def is_unchanged(self):
+        """Returns True if self.filename is known to be unchanged since this
+        section last read or wrote it. If it was modified too recently for its
+        fingerprint to be trusted, its contents are checked instead."""
+        if self._written is None:
+            return False
+        fingerprint = self.filename.fingerprint()
+        if fingerprint != self._written[1]:
+            return False
+        from time import time_ns
+        if time_ns() - fingerprint[2] >= racy:
+            return True
+        return self.hash_contents(self.filename.read()) == self._written[0]
+
+    @metrics.instrument('section.merge')
+    def merge_file(self, d):
+        """Called by self.write with the lock held, when self.filename may
+        have been changed by someone else. Returns the current contents of the
+        file, with the options which have changed between self._base and d
+        (both as returned by self.as_dictionary) applied to them, or None if
+        the file has not changed after all."""
+        contents = self.filename.read()
+        if self._written is not None and self.hash_contents(
+            contents
+        ) == self._written[0]:
+            return None
+        from .utils import flatten, expand, diff, patch
+        theirs = flatten(self.loader(contents))
+        patch(theirs, *diff(flatten(self._base or {}), flatten(d)))
+        return expand(theirs)
 
     def get(self, option, default=None):
         """Get a config option."""
@@ -267,17 +860,41 @@ class Section:
         except NoOptionError:
             return default
 
-    def validate(self):
+    @metrics.instrument('section.validate')
+    def validate(self, executor=None):
         """Return a dictionary of name: reason pairs yielded from validating
         every option on this section. Successfully-validated options will be
         left out so an empty dictionary can be counted as a successful
-        validation."""
-        errors = {}
+        validation.
+
+        If executor is a concurrent.futures executor, options whose validators
+        cost at least self.parallel_cost are validated in it, and the rest are
+        validated as normal. Options sent to a process pool are copied without
+        their section, so their validators (and values) must be picklable."""
+        if executor is not None:
+            from copy import copy
+            from concurrent.futures import ProcessPoolExecutor
+            processes = isinstance(executor, ProcessPoolExecutor)
+        results = []
         for name, option in self._options.items():
-            try:
-                option.check()
-            except ValidationError as e:
-                errors[name] = e.message
+            if executor is None or option.validator.cost < self.parallel_cost:
+                results.append((name, None, check_option(option)))
+            else:
+                if processes:
+                    option = copy(option)
+                    option.section = None
+                results.append(
+                    (name, executor.submit(check_option, option), None)
+                )
+        errors = {}
+        for name, future, message in results:
+            if future is not None:
+                message = future.result()
+            if message is not None:
+                errors[name] = message
+        if errors and metrics.sink is not None:
+            for name, message in errors.items():
+                metrics.sink.failure(self.get_path(name), message)
         return errors
 
     def __getitem__(self, option):
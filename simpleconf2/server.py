@@ -0,0 +1,280 @@
+"""
+Share one section between processes on the same host, over a Unix domain
+socket.
+
+A Server owns the section, so its files are only read (and watched) once.
+Clients apply what the server sends them to sections of their own, which
+they can read as normal. Clients receive the whole section when they first
+connect, and after that only the options which have changed whenever the
+server publishes a new version. A client which reconnects only receives the
+changes since the version it already has, if the server still remembers
+them.
+
+Messages are JSON objects, one per line. Sections are sent as flattened
+dictionaries (see utils.flatten) of serialised values.
+
+hello (client to server)
+Sent on connecting, with the version the client already has (or null).
+snapshot (server to client)
+Every option which differs from its default (data), and the version.
+delta (server to client)
+The options which have changed (changed) or been restored to their defaults
+(removed) between the versions base and version.
+"""
+
+import json
+import os
+import socket
+import socketserver
+import threading
+from attr import attrs, attrib, Factory
+from .utils import flatten, expand, diff, patch
+
+
+def encode(message):
+    """Return message as a line of JSON bytes."""
+    return (json.dumps(message, separators=(',', ':')) + '\n').encode()
+
+
+class Handler(socketserver.StreamRequestHandler):
+    """Handles a client connection for Server."""
+
+    def handle(self):
+        server = self.server.owner
+        try:
+            for line in self.rfile:
+                message = json.loads(line)
+                if message.get('type') == 'hello':
+                    server.subscribe(self.request, message.get('version'))
+        except (OSError, ValueError):
+            pass  # The client went away, or sent rubbish.
+        finally:
+            server.unsubscribe(self.request)
+
+
+@attrs
+class Server:
+    """
+    Serve section to clients connecting to the Unix socket path.
+
+    keep
+    How many versions of changes to remember for clients which reconnect.
+    Clients with older versions are sent a snapshot instead.
+    """
+
+    section = attrib()
+    path = attrib()
+    keep = attrib(default=Factory(lambda: 100))
+    version = attrib(default=Factory(lambda: 1), init=False)
+    _flat = attrib(default=Factory(dict), init=False, repr=False)
+    # (version, changed, removed) tuples, oldest first:
+    _deltas = attrib(default=Factory(list), init=False, repr=False)
+    _clients = attrib(default=Factory(set), init=False, repr=False)
+    _lock = attrib(default=Factory(threading.Lock), init=False, repr=False)
+    _server = attrib(default=Factory(lambda: None), init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self._flat = flatten(self.section.as_dictionary())
+
+    def start(self):
+        """Start serving in a background thread, and return self."""
+        if os.path.exists(self.path):
+            os.remove(self.path)  # Left behind by a server which died.
+        self._server = socketserver.ThreadingUnixStreamServer(
+            self.path, Handler
+        )
+        self._server.daemon_threads = True
+        self._server.owner = self
+        threading.Thread(
+            target=self._server.serve_forever, daemon=True
+        ).start()
+        return self
+
+    def stop(self):
+        """Stop serving, and disconnect every client."""
+        self._server.shutdown()
+        with self._lock:
+            for connection in self._clients:
+                try:
+                    connection.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass  # Already disconnected.
+            self._clients.clear()
+        self._server.server_close()
+        self._server = None
+        os.remove(self.path)
+
+    def publish(self):
+        """Send any changes to self.section to every client as a new version.
+        Returns True if anything had changed, False otherwise."""
+        with self._lock:
+            flat = flatten(self.section.as_dictionary())
+            changed, removed = diff(self._flat, flat)
+            if not changed and not removed:
+                return False
+            self._flat = flat
+            self.version += 1
+            self._deltas.append((self.version, changed, removed))
+            del self._deltas[:-self.keep]
+            data = encode(
+                dict(
+                    type='delta', base=self.version - 1,
+                    version=self.version, changed=changed, removed=removed
+                )
+            )
+            for connection in list(self._clients):
+                self.send(connection, data)
+            return True
+
+    def update(self, *args, **kwargs):
+        """Update self.section with args and kwargs, then publish the
+        result."""
+        self.section.update(*args, **kwargs)
+        return self.publish()
+
+    def reload(self, *args, **kwargs):
+        """Load self.section with args and kwargs, then publish the
+        result."""
+        self.section.load(*args, **kwargs)
+        return self.publish()
+
+    def get_message(self, version):
+        """Return the message to send to a client which has version."""
+        if version is not None and (
+            version == self.version or self._deltas and
+            self._deltas[0][0] - 1 <= version < self.version
+        ):
+            changed = {}
+            removed = set()
+            for number, their_changed, their_removed in self._deltas:
+                if number > version:
+                    patch(changed, their_changed, their_removed)
+                    removed.difference_update(their_changed)
+                    removed.update(their_removed)
+            return dict(
+                type='delta', base=version, version=self.version,
+                changed=changed, removed=sorted(removed)
+            )
+        return dict(type='snapshot', version=self.version, data=self._flat)
+
+    def subscribe(self, connection, version):
+        """Send connection whatever it needs to catch up from version, and
+        send it future versions as they are published."""
+        with self._lock:
+            if self.send(connection, encode(self.get_message(version))):
+                self._clients.add(connection)
+
+    def unsubscribe(self, connection):
+        """Stop sending versions to connection."""
+        with self._lock:
+            self._clients.discard(connection)
+
+    def send(self, connection, data):
+        """Send data to connection, forgetting it if it has gone away.
+        Returns True on success."""
+        try:
+            connection.sendall(data)
+            return True
+        except OSError:
+            self._clients.discard(connection)
+            return False
+
+
+def restore_path(section, path):
+    """Restore the option at the dotted path below section to its
+    default. Paths which do not exist are ignored."""
+    *names, option = path.split('.')
+    try:
+        for name in names:
+            section = section._sections[name]
+        section._options[option].restore()
+    except KeyError:
+        pass
+
+
+@attrs
+class Client:
+    """
+    Keep section up to date with the Server listening on the Unix socket
+    path.
+
+    Changes are applied to section in a background thread. If on_change is
+    given, it is called there with the (changed, removed) flattened paths
+    after each version is applied.
+    """
+
+    path = attrib()
+    section = attrib()
+    on_change = attrib(default=Factory(lambda: None))
+    version = attrib(default=Factory(lambda: None), init=False)
+    _flat = attrib(default=Factory(dict), init=False, repr=False)
+    _socket = attrib(default=Factory(lambda: None), init=False, repr=False)
+    _thread = attrib(default=Factory(lambda: None), init=False, repr=False)
+    _condition = attrib(
+        default=Factory(threading.Condition), init=False, repr=False
+    )
+
+    @property
+    def connected(self):
+        """Returns True if the client is receiving versions."""
+        return self._thread is not None and self._thread.is_alive()
+
+    def connect(self):
+        """Connect to the server, asking for whatever has changed since
+        self.version, and return self."""
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._socket.connect(self.path)
+        self._socket.sendall(encode(dict(type='hello', version=self.version)))
+        self._thread = threading.Thread(
+            target=self.receive, args=[self._socket], daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def close(self):
+        """Disconnect from the server."""
+        try:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass  # The server has already gone.
+        self._thread.join()
+        self._socket.close()
+
+    def receive(self, connection):
+        """Apply messages from connection until it is closed."""
+        try:
+            for line in connection.makefile('rb'):
+                self.apply(json.loads(line))
+        except (OSError, ValueError):
+            pass
+
+    def apply(self, message):
+        """Apply a snapshot or delta message to self.section."""
+        if message['type'] == 'snapshot':
+            changed, removed = diff(self._flat, message['data'])
+        elif message['base'] == self.version:
+            changed = message['changed']
+            removed = message['removed']
+        else:  # Missed a version, so start again.
+            self._socket.sendall(encode(dict(type='hello', version=None)))
+            return
+        with self._condition:
+            patch(self._flat, changed, removed)
+            for path in removed:
+                restore_path(self.section, path)
+            self.section.update(expand(changed))
+            self.version = message['version']
+            self._condition.notify_all()
+        if self.on_change is not None:
+            self.on_change(changed, removed)
+
+    def wait(self, version=None, timeout=None):
+        """Wait until self.version is at least version (or until any version
+        has been received if version is None). Returns False if timeout
+        seconds pass first, True otherwise."""
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: self.version is not None and (
+                    version is None or self.version >= version
+                ), timeout
+            )
@@ -0,0 +1,131 @@
+"""Provides the SQLiteFilename class, which stores sections in an SQLite
+database rather than a flat file.
+
+Every option is stored as a row, keyed by its dotted path (see utils.flatten)
+with a JSON-encoded value. The database is put into WAL mode so readers never
+block the writer.
+"""
+
+import sqlite3
+from json import loads, dumps
+from attr import attrs, attrib, Factory
+from . import metrics
+from .filename import Filename
+from .utils import flatten, expand
+
+
+@attrs
+class SQLiteFilename(Filename):
+    """
+    An SQLite database which can be used as Section.filename.
+
+    read returns a dictionary and write expects one, so Section.loader and
+    Section.dumper are not used.
+
+    name
+    The filename of the database.
+    table
+    The name of the table to store options in.
+    prefix
+    Only read and write paths starting with this string (for example
+    "login."). Use this to store several sections in one database.
+    timeout
+    How many seconds to wait for another process to finish writing.
+    """
+
+    structured = True
+
+    table = attrib(default=Factory(lambda: 'options'))
+    prefix = attrib(default=Factory(str))
+    timeout = attrib(default=Factory(lambda: 5.0))
+    _connection = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+    _rows = attrib(
+        default=Factory(lambda: None), init=False, repr=False, eq=False
+    )
+
+    def connect(self):
+        """Return a connection to the database, creating the table if
+        necessary."""
+        if self._connection is None:
+            connection = sqlite3.connect(self.name, timeout=self.timeout)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute(
+                'CREATE TABLE IF NOT EXISTS %s (path TEXT PRIMARY KEY, value '
+                'TEXT NOT NULL) WITHOUT ROWID' % self.table
+            )
+            self._connection = connection
+        return self._connection
+
+    def close(self):
+        """Close the database connection."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        self._rows = None
+        super(SQLiteFilename, self).close()
+
+    def fetch(self, prefix=None):
+        """Return a dictionary of path: JSON pairs for every row whose path
+        starts with prefix (self.prefix by default)."""
+        if prefix is None:
+            prefix = self.prefix
+        if prefix:
+            # Everything between prefix and the string which follows it.
+            end = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            cursor = self.connect().execute(
+                'SELECT path, value FROM %s WHERE path >= ? AND path < ?' % (
+                    self.table
+                ), (prefix, end)
+            )
+        else:
+            cursor = self.connect().execute(
+                'SELECT path, value FROM %s' % self.table
+            )
+        return dict(cursor)
+
+    @metrics.instrument('filename.read')
+    def read(self, prefix=None):
+        """Return the section data stored under prefix (self.prefix by
+        default). Only the matching rows are fetched, using the primary key
+        index."""
+        if prefix is None:
+            prefix = self.prefix
+            rows = self._rows = self.fetch()
+        else:
+            rows = self.fetch(prefix)
+        return expand(
+            {path: loads(value) for path, value in rows.items()},
+            prefix=prefix
+        )
+
+    @metrics.instrument('filename.write')
+    def write(self, data):
+        """Store data in the database, only touching rows which have changed
+        since this database was last read or written. Return the number of
+        rows which were changed."""
+        rows = {
+            path: dumps(value) for path, value in flatten(
+                data, prefix=self.prefix
+            ).items()
+        }
+        connection = self.connect()
+        with connection:  # One transaction.
+            if self._rows is None:
+                self._rows = self.fetch()
+            changed = [
+                (path, value) for path, value in rows.items()
+                if self._rows.get(path) != value
+            ]
+            removed = [(path,) for path in self._rows if path not in rows]
+            connection.executemany(
+                'INSERT INTO %s (path, value) VALUES (?, ?) ON CONFLICT '
+                '(path) DO UPDATE SET value = excluded.value' % self.table,
+                changed
+            )
+            connection.executemany(
+                'DELETE FROM %s WHERE path = ?' % self.table, removed
+            )
+        self._rows = rows
+        return len(changed) + len(removed)
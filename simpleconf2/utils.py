@@ -0,0 +1,53 @@
+"""Utilities for working with the dictionaries returned by
+Section.as_dictionary.
+
+Flattened dictionaries map dotted paths (section.subsection.option) to option
+values.
+"""
+
+
+def flatten(data, prefix=''):
+    """Return the section data as a flat dictionary of path: value pairs.
+    Every path starts with prefix."""
+    flat = {}
+    for name, value in data.get('options', {}).items():
+        flat[prefix + name] = value
+    for name, section in data.get('sections', {}).items():
+        flat.update(flatten(section, prefix + name + '.'))
+    return flat
+
+
+def expand(flat, prefix=''):
+    """The opposite of flatten. Paths which do not start with prefix are
+    ignored, and prefix is removed from the rest."""
+    data = {}
+    for path, value in flat.items():
+        if not path.startswith(prefix):
+            continue
+        *names, option = path[len(prefix):].split('.')
+        section = data
+        for name in names:
+            section = section.setdefault(
+                'sections', {}
+            ).setdefault(name, {})
+        section.setdefault('options', {})[option] = value
+    return data
+
+
+def diff(old, new):
+    """Compare two flat dictionaries, returning (changed, removed), where
+    changed is a dictionary of the paths in new whose values differ from old,
+    and removed is a list of the paths in old which are not in new."""
+    changed = {
+        path: value for path, value in new.items()
+        if path not in old or old[path] != value
+    }
+    removed = [path for path in old if path not in new]
+    return changed, removed
+
+
+def patch(flat, changed, removed):
+    """Apply the results of diff to the flat dictionary flat in place."""
+    flat.update(changed)
+    for path in removed:
+        flat.pop(path, None)
@@ -26,15 +26,84 @@ with self.raises():
 Or:
 with self.raises(ValueError):
     <code>
+
+Validators also decide how values are compared with defaults (equal), and
+how they are stored by Section.as_dictionary (serialise) and read back by
+Section.update (deserialise). By default values are stored as they are.
+
+The results of expensive validators can be cached by calling their memoize
+method, for example:
+QuickValidator(func=check_hostname).memoize(size=256, ttl=60)
 """
 
 import re
+from collections import OrderedDict, namedtuple
 from contextlib import contextmanager
-import six
+from time import monotonic
 from attr import attrs, attrib, Factory
 from .exceptions import ValidationError
 
 
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'maxsize', 'currsize'])
+
+
+@attrs
+class ValidatorCache:
+    """
+    A bounded least-recently-used cache of validation results.
+
+    size
+    The maximum number of results to keep.
+    ttl
+    The number of seconds results are valid for, or None if they never
+    expire.
+    clock
+    The function used to get the current time.
+    """
+
+    size = attrib(default=Factory(lambda: 128))
+    ttl = attrib(default=Factory(lambda: None))
+    clock = attrib(default=Factory(lambda: monotonic))
+    hits = attrib(default=Factory(int), init=False)
+    misses = attrib(default=Factory(int), init=False)
+    _results = attrib(
+        default=Factory(OrderedDict), init=False, repr=False, eq=False
+    )
+
+    def get(self, key):
+        """Return (True, message) if there is a result for key, or (False,
+        None) otherwise. Message is None if the value was valid."""
+        try:
+            message, expires = self._results[key]
+        except KeyError:
+            self.misses += 1
+            return False, None
+        if expires is not None and expires <= self.clock():
+            del self._results[key]
+            self.misses += 1
+            return False, None
+        self._results.move_to_end(key)
+        self.hits += 1
+        return True, message
+
+    def put(self, key, message):
+        """Store the result for key."""
+        expires = None if self.ttl is None else self.clock() + self.ttl
+        self._results[key] = (message, expires)
+        self._results.move_to_end(key)
+        while len(self._results) > self.size:
+            self._results.popitem(last=False)
+
+    def clear(self):
+        """Forget all results. Do this after changing the settings of the
+        validator which owns this cache."""
+        self._results.clear()
+
+    def info(self):
+        """Return statistics about this cache as a CacheInfo instance."""
+        return CacheInfo(self.hits, self.misses, self.size, len(self._results))
+
+
 @attrs
 class MinMaxMixin:
     """Take mix and max values."""
@@ -46,10 +115,67 @@ class MinMaxMixin:
 class Validator:
     """The base class from which all validators are derived."""
 
+    cache = None  # Set by self.memoize.
+    # A rough guide to how expensive validation is. Section.validate only
+    # sends options to an executor if their validators cost at least
+    # Section.parallel_cost.
+    cost = 1
+    # True unless a subclass overrides equal, serialise or deserialise, so
+    # sections can skip calling them. Set for every subclass as it is made.
+    plain = True
+
+    def __init_subclass__(cls, **kwargs):
+        super(Validator, cls).__init_subclass__(**kwargs)
+        cls.plain = (
+            cls.equal is Validator.equal and
+            cls.serialise is Validator.serialise and
+            cls.deserialise is Validator.deserialise
+        )
+
     def validate(self, option):
         """Check option.value."""
         raise NotImplementedError('Use a proper validator.')
 
+    def equal(self, value, default):
+        """Returns True if value is the same as default."""
+        return value == default
+
+    def serialise(self, value):
+        """Return value in a form which can be dumped."""
+        return value
+
+    def deserialise(self, value):
+        """Return the value which serialise turned into value."""
+        return value
+
+    def memoize(self, size=128, ttl=None):
+        """Cache the results of checking hashable values in a ValidatorCache
+        with the given size and ttl. Results are keyed on the value alone, so
+        only use this with validators which don't look at anything else.
+        Returns self."""
+        self.cache = ValidatorCache(size=size, ttl=ttl)
+        return self
+
+    def check(self, option):
+        """Validate option, using self.cache if it has been set."""
+        if self.cache is None:
+            return self.validate(option)
+        value = option.value
+        key = (value.__class__, value)  # So 1 and True are different keys.
+        try:
+            found, message = self.cache.get(key)
+        except TypeError:  # Unhashable.
+            return self.validate(option)
+        if not found:
+            try:
+                self.validate(option)
+                message = None
+            except ValidationError as e:
+                message = e.message
+            self.cache.put(key, message)
+        if message is not None:
+            raise ValidationError(message)
+
     def test(self, *args, **kwargs):
         """Run tests on this validator."""
         raise NotImplementedError
@@ -131,7 +257,7 @@ class String(Validator):
 
     def validate(self, option):
         """Checks that the value is a string."""
-        if not isinstance(option.value, six.string_types):
+        if not isinstance(option.value, str):
             raise ValidationError('Expected a string, not %r.' % option.value)
 
     def test(self, o):
@@ -210,7 +336,7 @@ class RegexpString(String):
     def __attrs_post_init__(self):
         """Pattern can be either a plain old string or a compiled regular
         expression."""
-        if isinstance(self.pattern, six.string_types):
+        if isinstance(self.pattern, str):
             self.pattern = re.compile(self.pattern)
 
     def validate(self, option):
@@ -303,6 +429,8 @@ class QuickValidator(Validator):
     self.func returns anything, it will be used as the string passed to a raise
     of ValidationError via str."""
 
+    cost = 10  # Assume self.func is expensive.
+
     func = attrib(
         default=Factory(
             lambda: lambda option: 'This will always fail'
@@ -397,3 +525,122 @@ class Dict(Validator, MinMaxMixin):
         self.min = None
         with self.raises():
             o.check()
+
+
+def import_numpy():
+    """Return the numpy module, raising ValidationError if it isn't
+    installed."""
+    try:
+        import numpy
+    except ImportError:
+        raise ValidationError('NumPy is not installed.')
+    return numpy
+
+
+@attrs
+class NumericArray(Validator, MinMaxMixin):
+    """Ensure the provided value is a NumPy array with the given dtype and
+    shape, and that all its elements are between min and max.
+
+    Items in shape can be None to allow any length in that dimension. Arrays
+    are serialised as dictionaries holding their dtype, shape and base64
+    encoded data. Lists are also accepted when loading.
+
+    NumPy is only imported when it is needed."""
+
+    dtype = attrib(default=Factory(lambda: 'float64'))
+    shape = attrib(default=Factory(lambda: None))
+
+    def validate(self, option):
+        numpy = import_numpy()
+        v = option.value
+        if not isinstance(v, numpy.ndarray):
+            raise ValidationError('Not an array: %r.' % v)
+        if self.dtype is not None and v.dtype != numpy.dtype(self.dtype):
+            raise ValidationError(
+                'Expected an array of %s, not %s.' % (self.dtype, v.dtype)
+            )
+        if self.shape is not None and (
+            len(v.shape) != len(self.shape) or any(
+                expected is not None and expected != actual
+                for expected, actual in zip(self.shape, v.shape)
+            )
+        ):
+            raise ValidationError(
+                'Expected an array with shape %s, not %s.' % (
+                    tuple(self.shape), v.shape
+                )
+            )
+        if v.size and (
+            (self.min is not None and v.min() < self.min) or
+            (self.max is not None and v.max() > self.max)
+        ):
+            raise ValidationError(
+                'Expecting values between %s and %s.' % (
+                    'anything' if self.min is None else self.min,
+                    'anything' if self.max is None else self.max
+                )
+            )
+
+    def equal(self, value, default):
+        """Compare arrays with numpy.array_equal."""
+        if value is default:
+            return True
+        numpy = import_numpy()
+        if isinstance(value, numpy.ndarray) or isinstance(
+            default, numpy.ndarray
+        ):
+            return numpy.array_equal(value, default)
+        return value == default
+
+    def serialise(self, value):
+        numpy = import_numpy()
+        if not isinstance(value, numpy.ndarray):
+            return value
+        from base64 import b64encode
+        return {
+            'dtype': value.dtype.str,
+            'shape': list(value.shape),
+            'data': b64encode(
+                numpy.ascontiguousarray(value).tobytes()
+            ).decode('ascii')
+        }
+
+    def deserialise(self, value):
+        numpy = import_numpy()
+        if isinstance(value, dict) and 'data' in value:
+            from base64 import b64decode
+            return numpy.frombuffer(
+                bytearray(b64decode(value['data'])), dtype=value['dtype']
+            ).reshape(value['shape'])
+        if isinstance(value, list):
+            return numpy.asarray(value, dtype=self.dtype)
+        return value
+
+    def test(self, o):
+        try:
+            numpy = import_numpy()
+        except ValidationError:
+            return  # NumPy is optional.
+        o.value = numpy.zeros((2, 3))
+        o.check()
+        o.value = [0.0]
+        with self.raises():
+            o.check()
+        o.value = numpy.zeros(3, dtype='int32')
+        with self.raises():
+            o.check()
+        self.dtype = None
+        o.check()
+        self.shape = (None, 3)
+        with self.raises():
+            o.check()
+        o.value = numpy.zeros((5, 3), dtype='int32')
+        o.check()
+        self.max = -1
+        with self.raises():
+            o.check()
+        self.max = None
+        self.min = 1
+        with self.raises():
+            o.check()
@@ -0,0 +1,63 @@
+"""Test loading many sections at once."""
+
+from concurrent.futures import ProcessPoolExecutor
+from json import loads
+from simpleconf2 import Section, Option, exceptions
+from simpleconf2.bulk import load_all
+
+
+def Config(*args, **kwargs):
+    """Return a section with an option of its own."""
+    cls = type('Config', (Section,), {'name': Option('test')})
+    return cls(*args, **kwargs)
+
+
+def test_load_all(tmp_path):
+    sections = []
+    for x in range(10):
+        filename = str(tmp_path / ('%d.json' % x))
+        with open(filename, 'w') as f:
+            f.write('{"options": {"name": "Section %d"}}' % x)
+        sections.append(Config(filename=filename, load=False))
+    broken = str(tmp_path / 'broken.json')
+    with open(broken, 'w') as f:
+        f.write('{"options"')
+    sections.append(Config(filename=broken, load=False))
+    sections.append(Config(load=False))  # No filename.
+    sections.append(Config(filename=str(tmp_path / 'missing.json')))
+    errors = load_all(sections, max_workers=4)
+    assert errors[:10] == [None] * 10
+    assert isinstance(errors[10], ValueError)
+    assert isinstance(errors[11], exceptions.NoFileError)
+    assert errors[12] is None
+    assert [s['name'] for s in sections[:10]] == [
+        'Section %d' % x for x in range(10)
+    ]
+    for section in sections:
+        section.restore()
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        errors = load_all(sections[:10], executor=executor, loader=loads)
+    assert errors == [None] * 10
+    assert sections[5]['name'] == 'Section 5'
+
+
+def test_locking(tmp_path):
+    cls = type(
+        'Config', (Section,), {
+            'locking': True, 'a': Option(0), 'b': Option(0)
+        }
+    )
+    filename = str(tmp_path / 'config.json')
+    with open(filename, 'w') as f:
+        f.write('{"options": {"a": 1}}')
+    section = cls(filename=filename, load=False)
+    assert load_all([section]) == [None]
+    other = cls(filename=filename)
+    other['a'] = 2
+    other.write()
+    section['b'] = 5
+    section.write()
+    assert section['a'] == 2
+    assert cls(filename=filename).as_dictionary() == {
+        'options': {'a': 2, 'b': 5}
+    }
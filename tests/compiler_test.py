@@ -0,0 +1,107 @@
+"""Test schema compilation."""
+
+from pytest import raises
+from simpleconf2 import Section, Option, validators, exceptions
+from simpleconf2.compiler import compile_section
+
+
+class Upper(validators.String):
+    """Store strings in upper case."""
+
+    def serialise(self, value):
+        return value.upper()
+
+    def deserialise(self, value):
+        return value.lower()
+
+
+def make_config():
+    class Config(Section):
+        name = Option('test')
+        number = Option(5, validator=validators.Integer)
+        shout = Option('hello', validator=Upper)
+
+        class dog(Section):
+            name = Option('Fido')
+            age = Option(3, validator=validators.Integer)
+
+            class collar(Section):
+                colour = Option('red')
+
+    return Config
+
+
+data = {
+    'options': {'name': 'changed', 'shout': 'GOODBYE'},
+    'sections': {
+        'dog': {
+            'options': {'age': 4},
+            'sections': {'collar': {'options': {'colour': 'blue'}}}
+        }
+    }
+}
+
+
+def test_compiled():
+    Config = compile_section(make_config())
+    assert Config.update.compiled is Config
+    assert Config.dog.as_dictionary.compiled is Config.dog
+    generic = make_config()()
+    c = Config()
+    assert c.as_dictionary() == {}
+    assert c.as_dictionary(full=True) == generic.as_dictionary(full=True)
+    c.update(data)
+    generic.update(data)
+    assert c['shout'] == 'goodbye'
+    assert c.dog.collar['colour'] == 'blue'
+    assert c.as_dictionary() == generic.as_dictionary() == data
+    c.mark_clean()
+    c.update({'options': {'number': 6}})
+    assert c['number'] == 6
+    assert c._dirty
+    with raises(exceptions.NoOptionError):
+        c.update({'options': {'nothing': 1}}, ignore_missing_options=False)
+    c.restore()
+    assert c.as_dictionary() == {}
+    assert c.dog.collar['colour'] == 'red'
+
+
+def test_fallback():
+    Config = compile_section(make_config())
+
+    class Child(Config):
+        name = Option('child')
+
+    c = Child()
+    c.update({'options': {'name': 'changed'}})
+    assert c['name'] == 'changed'
+    assert Config.name.value == 'test'
+    c = Config()
+    c.add_option('extra', Option(1))
+    c.update({'options': {'extra': 2, 'name': 'changed'}})
+    assert c.as_dictionary() == {'options': {'extra': 2, 'name': 'changed'}}
+
+
+def test_overridden():
+    class Config(Section):
+        name = Option('test')
+
+        def as_dictionary(self, full=False, shards=True):
+            return {'overridden': True}
+
+    compile_section(Config)
+    assert Config().as_dictionary() == {'overridden': True}
+    assert Config.restore.compiled is Config
+
+
+def test_instances():
+    Config = compile_section(make_config())
+    a = Config()
+    b = Config()
+    a.update(data)
+    assert a.as_dictionary() == data
+    assert b.as_dictionary() == {}
+    b.update({'options': {'number': 6}})
+    a.restore()
+    assert a.as_dictionary() == {}
+    assert b.as_dictionary() == {'options': {'number': 6}}
@@ -0,0 +1,159 @@
+"""
+A minimal stand-in for wxPython, so the dialogs can be tested and benchmarked
+without a display (or wx itself).
+
+Only the parts of wx used by simpleconf2.dialogs.wx are provided. Windows and
+grid properties do nothing except remember their values and count how many of
+them have been created.
+"""
+
+import sys
+from itertools import count
+from types import ModuleType
+
+counts = {'windows': 0, 'properties': 0}
+ids = count(1)
+
+
+def nothing(*args, **kwargs):
+    """Used for every method the benchmarks don't care about."""
+
+
+class Event:
+    """An event which can be passed to handlers."""
+
+    def __init__(self, prop=None, id=None):
+        self.prop = prop
+        self.id = id
+
+    def GetProperty(self):
+        return self.prop
+
+    def GetId(self):
+        return self.id
+
+    def Skip(self):
+        pass
+
+
+class Window:
+    """Any wx window."""
+
+    def __init__(self, *args, **kwargs):
+        counts['windows'] += 1
+        self.id = next(ids)
+        self.value = None
+        self.handlers = {}
+
+    def GetId(self):
+        return self.id
+
+    def SetValue(self, value):
+        self.value = value
+
+    def GetValue(self):
+        return self.value
+
+    def Bind(self, event, handler):
+        self.handlers[event] = handler
+
+    def __getattr__(self, name):
+        if name[:1].isupper():
+            return nothing
+        raise AttributeError(name)
+
+
+class Property:
+    """A row in a property grid."""
+
+    def __init__(self, label='', name='', value=None):
+        counts['properties'] += 1
+        self.label = label
+        self.name = name
+        self.value = value
+        self.children = []
+
+    def GetName(self):
+        return self.name
+
+    def SetLabel(self, label):
+        self.label = label
+
+
+class PropertyGrid(Window):
+    """A property grid. Only the row being edited would have a native
+    control, so rows aren't counted as windows."""
+
+    def __init__(self, *args, **kwargs):
+        super(PropertyGrid, self).__init__(*args, **kwargs)
+        self.properties = {}
+
+    def Append(self, prop):
+        self.properties[prop.name] = prop
+        return prop
+
+    def AppendIn(self, parent, prop):
+        parent.children.append(prop)
+        return self.Append(prop)
+
+    def DeleteProperty(self, name):
+        del self.properties[name]
+
+    def SetPropertyValue(self, name, value):
+        self.properties[name].value = value
+
+    def GetPropertyValue(self, name):
+        return self.properties[name].value
+
+    def Expand(self, prop):
+        """Simulate the user expanding prop."""
+        self.handlers[EVT_PG_ITEM_EXPANDED](Event(prop))
+
+
+EVT_PG_ITEM_EXPANDED = 'EVT_PG_ITEM_EXPANDED'
+
+
+def install():
+    """Put the fake wx modules into sys.modules, and return the fake wx
+    module."""
+    modules = {}
+    for name in (
+        'wx', 'wx.lib', 'wx.lib.sized_controls', 'wx.lib.agw',
+        'wx.lib.agw.floatspin', 'wx.lib.intctrl', 'wx.propgrid'
+    ):
+        modules[name] = ModuleType(name)
+    wx = modules['wx']
+    for name in (
+        'Frame', 'Button', 'StaticText', 'CheckBox', 'TextCtrl', 'Choice'
+    ):
+        setattr(wx, name, type(name, (Window,), {}))
+    for name in (
+        'EVT_BUTTON', 'EVT_TEXT', 'EVT_CHECKBOX', 'EVT_CHOICE',
+        'EVT_SPINCTRL'
+    ):
+        setattr(wx, name, name)
+    wx.ICON_EXCLAMATION = 0
+    wx.MessageBox = nothing
+    wx.lib = modules['wx.lib']
+    wx.propgrid = modules['wx.propgrid']
+    modules['wx.lib.sized_controls'].SizedPanel = type(
+        'SizedPanel', (Window,), {}
+    )
+    modules['wx.lib.agw.floatspin'].FloatSpin = type(
+        'FloatSpin', (Window,), {}
+    )
+    modules['wx.lib.agw.floatspin'].EVT_FLOATSPIN = 'EVT_FLOATSPIN'
+    modules['wx.lib.intctrl'].IntCtrl = type('IntCtrl', (Window,), {})
+    modules['wx.lib.intctrl'].EVT_INT = 'EVT_INT'
+    propgrid = modules['wx.propgrid']
+    propgrid.PropertyGrid = PropertyGrid
+    propgrid.PG_SPLITTER_AUTO_CENTER = 0
+    propgrid.EVT_PG_ITEM_EXPANDED = EVT_PG_ITEM_EXPANDED
+    propgrid.EVT_PG_CHANGED = 'EVT_PG_CHANGED'
+    for name in (
+        'BoolProperty', 'IntProperty', 'FloatProperty', 'StringProperty',
+        'PropertyCategory'
+    ):
+        setattr(propgrid, name, type(name, (Property,), {}))
+    sys.modules.update(modules)
+    return wx
@@ -1,8 +1,11 @@
 """Test filenames."""
 
 import os.path
+import threading
+from importlib.util import find_spec
 from io import StringIO
-from simpleconf2.filename import Filename
+from simpleconf2 import metrics
+from simpleconf2.filename import Filename, extensions
 
 
 def test_defaults():
@@ -30,3 +33,73 @@ def test_with_filelike():
     assert f.exists() is True
     assert f.read() == s
     assert f.read() == s
+
+
+def test_mmap(tmp_path):
+    name = str(tmp_path / 'test.json')
+    with open(name, 'w') as f:
+        f.write('{"options": {}}')
+    f = Filename(name, use_mmap=True)
+    buffer = f.read()
+    assert isinstance(buffer, memoryview)
+    assert bytes(buffer) == b'{"options": {}}'
+    assert f.read() is buffer  # Not remapped.
+    f.write('{}')
+    assert bytes(buffer) == b'{"options": {}}'  # Old mapping still valid.
+    assert bytes(f.read()) == b'{}'
+    f.write('')
+    assert bytes(f.read()) == b''
+    f.close()
+    assert f._mmap is None
+
+
+def test_lock(tmp_path):
+    f = Filename(str(tmp_path / 'test.json'))
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with f.lock():
+            locked.set()
+            release.wait()
+
+    registry = metrics.Registry()
+    metrics.set_sink(registry)
+    try:
+        thread = threading.Thread(target=hold)
+        thread.start()
+        locked.wait()
+        threading.Timer(0.05, release.set).start()
+        with f.lock() as lock:
+            assert release.is_set()  # Had to wait for the thread.
+            assert lock.name == f.name + '.lock'
+        thread.join()
+    finally:
+        metrics.set_sink(None)
+    assert registry.counts['filename.lock'] == 2
+    assert registry.counts['filename.lock_wait'] == 1
+    assert registry.durations['filename.lock_wait'] > 0.01
+
+
+def test_compression(tmp_path):
+    data = '{"options": {"list": [%s]}}' % ', '.join(['1'] * 1000)
+    for extension, compression in extensions.items():
+        if compression in ('zstd', 'lz4') and find_spec(
+            'zstandard' if compression == 'zstd' else 'lz4'
+        ) is None:
+            continue  # Optional dependency.
+        name = str(tmp_path / ('test.json' + extension))
+        f = Filename(name, compression_level=1)
+        assert f.get_compression() == compression
+        f.write(data)
+        assert os.path.getsize(name) < len(data) / 10
+        assert f.read() == data
+    f = Filename(str(tmp_path / 'test.json'), compression='gzip')
+    f.write(data)
+    assert f.read() == data
+    with open(f.name, 'rb') as fp:
+        assert fp.read(2) == b'\x1f\x8b'  # The gzip magic number.
+    f = Filename(str(tmp_path / 'plain.gz'), compression=False)
+    assert f.get_compression() is None
+    f.write(data)
+    assert f.read() == data
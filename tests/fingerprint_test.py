@@ -0,0 +1,93 @@
+"""Test section fingerprints."""
+
+from simpleconf2 import Section, Option, validators
+
+
+def make_config():
+    class Config(Section):
+        name = Option('test')
+        number = Option(5, validator=validators.Integer)
+
+        class dog(Section):
+            name = Option('Fido')
+
+            class collar(Section):
+                colour = Option('red')
+
+    return Config
+
+
+def test_fingerprint():
+    a = make_config()()
+    b = make_config()()
+    fingerprint = a.fingerprint()
+    assert fingerprint == b.fingerprint()
+    assert a.fingerprint() is fingerprint  # Cached.
+    a['number'] = 6
+    assert a._fingerprint is None
+    assert a.fingerprint() != fingerprint
+    assert a.diff(b) == ['number']
+    a['number'] = 5
+    assert a.fingerprint() == fingerprint
+    a.dog.collar['colour'] = 'blue'
+    assert a.dog._fingerprint is None
+    assert a.diff(b) == ['dog.collar.colour']
+    b.dog.collar['colour'] = 'blue'
+    assert a.fingerprint() == b.fingerprint()
+    assert a.diff(b) == []
+
+
+def test_mark_dirty():
+    a = make_config()()
+    a.dog.collar['colour'] = 'blue'
+    assert a._dirty and a.dog._dirty
+    a.fingerprint()
+    a.dog.collar['colour'] = 'green'  # Dirty, but with fingerprints.
+    assert a._fingerprint is None and a.dog._fingerprint is None
+    a._dirty = False
+    a.dog.collar['colour'] = 'blue'  # Stops at the collar.
+    assert not a._dirty
+
+
+def test_pending():
+    data = {
+        'sections': {
+            'dog': {
+                'options': {'name': 'Fido', 'removed': 1},
+                'sections': {'collar': {'options': {'colour': 'blue'}}}
+            }
+        }
+    }
+    a = make_config()()
+    b = make_config()()
+    empty = a.fingerprint()
+    a.update(data)
+    assert not a._sections.is_loaded('dog')
+    assert a.fingerprint() != empty
+    assert not a._sections.is_loaded('dog')
+    b.update(data)
+    b.dog.collar
+    assert b._sections.is_loaded('dog')
+    assert a.fingerprint() == b.fingerprint()
+    assert a.as_dictionary() == b.as_dictionary() == {
+        'sections': {
+            'dog': {'sections': {'collar': {'options': {'colour': 'blue'}}}}
+        }
+    }
+    a.restore()
+    assert a.fingerprint() == empty
+
+
+def test_instances():
+    Config = make_config()
+    a = Config()
+    fingerprint = a.fingerprint()
+    b = Config()
+    a['number'] = 6
+    assert a.fingerprint() != fingerprint
+    assert b.fingerprint() == fingerprint
+    fingerprint = a.fingerprint()
+    a.dog.collar
+    b.dog.collar['colour'] = 'blue'
+    assert a.fingerprint() == fingerprint
+    assert a.diff(b) == ['dog.collar.colour', 'number']
@@ -0,0 +1,52 @@
+"""Test version history."""
+
+from pytest import raises
+from simpleconf2 import Section, Option, exceptions
+from simpleconf2.history import History
+
+
+class Config(Section):
+    name = Option('test')
+
+    class dog(Section):
+        name = Option('Fido')
+
+
+def test_history(tmp_path):
+    c = Config(filename=str(tmp_path / 'config.json'), load=False)
+    with raises(exceptions.NoHistoryError):
+        c.at(1)
+    c.history = True
+    for x in range(1, 6):
+        c['name'] = 'Version %d' % x
+        c.write()
+    c.dog['name'] = 'Rex'
+    c.write()
+    c.write()  # Nothing changed, so no new version.
+    assert c.history.name == str(tmp_path / 'config.json.history')
+    assert c.history.versions() == list(range(1, 7))
+    assert c.at(2) == {'options': {'name': 'Version 2'}}
+    c.rollback(3)
+    assert c['name'] == 'Version 3'
+    assert c.dog['name'] == 'Fido'
+    c.rollback(6)
+    assert c.dog['name'] == 'Rex'
+    with raises(exceptions.NoVersionError):
+        c.at(7)
+    h = History(c.history.name)  # Reads the log back in.
+    assert h.latest() == 6
+    assert h.at(4) == c.at(4)
+
+
+def test_compact(tmp_path):
+    h = History(str(tmp_path / 'history'), checkpoint_interval=3, keep=5)
+    for x in range(50):
+        h.record({'options': {'x': x}})
+    versions = h.versions()
+    assert 5 <= len(versions) <= 5 + 3 + 3
+    assert versions[-1] == 50
+    for version in versions:
+        assert h.at(version) == {'options': {'x': version - 1}}
+    h = History(h.name)
+    assert h.versions() == versions
+    assert h.at(versions[0]) == {'options': {'x': versions[0] - 1}}
@@ -0,0 +1,38 @@
+"""Make sure importing simpleconf2 stays cheap."""
+
+import os.path
+import subprocess
+import sys
+
+root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def get_imports(code):
+    """Return the names of the modules imported by running code in a fresh
+    interpreter with -X importtime, which an empty interpreter doesn't
+    import."""
+    def run(code):
+        p = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', code], cwd=root,
+            stderr=subprocess.PIPE, universal_newlines=True, check=True
+        )
+        return {
+            line.split('|')[-1].strip() for line in p.stderr.splitlines()
+            if line.startswith('import time:') and 'imported package' not in
+            line
+        }
+    return run(code) - run('pass')
+
+
+def test_import():
+    assert get_imports('import simpleconf2') == {'simpleconf2'}
+
+
+def test_import_section():
+    imports = get_imports('from simpleconf2 import Section')
+    assert 'simpleconf2.section' in imports
+    for name in (
+        'six', 'json', 'logging', 'base64', 'sqlite3', 'concurrent.futures',
+        'simpleconf2.history', 'simpleconf2.sqlite', 'simpleconf2.bulk'
+    ):
+        assert name not in imports
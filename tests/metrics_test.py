@@ -0,0 +1,82 @@
+"""Test instrumentation."""
+
+import logging
+import os.path
+from simpleconf2 import Section, Option, validators, metrics
+
+
+class Config(Section):
+    name = Option('test', validator=validators.String)
+
+    class dog(Section):
+        age = Option(3, validator=validators.Integer(min=0))
+
+
+def test_disabled():
+    assert metrics.sink is None
+    c = Config()
+    c.update({'options': {'name': 'Joe'}})
+    assert metrics.sink is None
+
+
+def test_registry(tmp_path):
+    registry = metrics.PrometheusRegistry()
+    assert metrics.set_sink(registry) is None
+    try:
+        c = Config(filename=str(tmp_path / 'config.json'))  # Loads.
+        c['name'] = 'Joe'
+        c.dog['age'] = -1
+        c.write()
+        c.load()
+        assert c.dog.validate() == {'age': 'Expecting an integer between 0 '
+                                    'and anything.'}
+    finally:
+        assert metrics.set_sink(None) is registry
+    assert registry.counts == {
+        'section.write': 1, 'filename.write': 1, 'section.load': 2,
+        'filename.read': 1, 'section.update': 1, 'section.validate': 1
+    }
+    size = len(
+        '{"sections": {"dog": {"options": {"age": -1}}}, '
+        '"options": {"name": "Joe"}}'
+    )
+    assert registry.sizes == {'filename.write': size, 'filename.read': size}
+    assert registry.failures == {'dog.age': 1}
+    text = registry.render()
+    assert 'simpleconf2_calls_total{event="section.load"} 2\n' in text
+    assert 'simpleconf2_validation_failures_total{path="dog.age"} 1\n' in text
+    registry.clear()
+    assert registry.counts == {}
+
+
+def test_logging(caplog):
+    metrics.set_sink(metrics.LoggingSink())
+    try:
+        with caplog.at_level(logging.DEBUG, logger='simpleconf2.metrics'):
+            c = Config()
+            c.update({'options': {'name': 5}})
+            c.validate()
+    finally:
+        metrics.set_sink(None)
+    messages = [r.getMessage() for r in caplog.records]
+    assert messages[0].startswith('section.update took ')
+    assert messages[1] == 'name failed validation: Expected a string, not 5.'
+
+
+def test_sizes(tmp_path):
+    registry = metrics.Registry()
+    metrics.set_sink(registry)
+    try:
+        for name in ('config.json', 'config.json.gz'):
+            filename = str(tmp_path / name)
+            c = Config(filename=filename)
+            c['name'] = 'é' * 100
+            c.write(ensure_ascii=False)
+            c.load()
+            size = os.path.getsize(filename)
+            assert registry.sizes == {
+                'filename.write': size, 'filename.read': size
+            }
+            registry.clear()
+    finally:
+        metrics.set_sink(None)
@@ -0,0 +1,90 @@
+"""Test overlays."""
+
+from pytest import raises
+from simpleconf2 import Section, Option, validators, exceptions
+
+
+class Config(Section):
+    name = Option('test')
+    number = Option(5, validator=validators.Integer(max=10))
+
+    class dog(Section):
+        name = Option('Fido')
+
+        class collar(Section):
+            colour = Option('red')
+
+
+def test_overlay():
+    c = Config()
+    c['name'] = 'base'
+    o = c.overlay()
+    assert o['name'] == 'base'
+    assert o.as_dictionary() == c.as_dictionary()
+    o['number'] = 6
+    o.dog.collar['colour'] = 'blue'
+    assert o['number'] == 6
+    assert c['number'] == 5
+    assert c.dog.collar['colour'] == 'red'
+    assert o.as_dictionary() == {
+        'options': {'name': 'base', 'number': 6},
+        'sections': {'dog': {'sections': {'collar': {
+            'options': {'colour': 'blue'}
+        }}}}
+    }
+    o['name'] = 'test'  # Back to the default.
+    assert o.as_dictionary()['options'] == {'number': 6}
+    c['number'] = 7
+    assert o['number'] == 6  # Overridden.
+    assert o.dog['name'] == 'Fido'
+    c.dog['name'] = 'Rex'
+    assert o.dog['name'] == 'Rex'  # Read through.
+    assert o.title == c.title
+    for name in ('write', 'load', 'walk', 'name'):
+        with raises(AttributeError):
+            getattr(o, name)
+    with raises(exceptions.NoOptionError):
+        o['nothing'] = 1
+    o['number'] = 11
+    assert list(o.validate()) == ['number']
+    o.restore()
+    assert o.as_dictionary() == c.as_dictionary()
+    c.restore()
+
+
+def test_nested():
+    c = Config()
+    o = c.overlay()
+    o.update({'options': {'number': 6}})
+    nested = o.overlay()
+    nested.update({'sections': {'dog': {'options': {'name': 'Rex'}}}})
+    assert nested['number'] == 6
+    assert nested.as_dictionary() == {
+        'options': {'number': 6},
+        'sections': {'dog': {'options': {'name': 'Rex'}}}
+    }
+    assert o.as_dictionary() == {'options': {'number': 6}}
+    assert c.as_dictionary() == {}
+
+
+def test_fingerprint():
+    c = Config()
+    o = c.overlay()
+    assert o.fingerprint() == c.fingerprint()
+    o.dog.collar['colour'] = 'blue'
+    assert o.fingerprint() != c.fingerprint()
+    c.dog.collar['colour'] = 'blue'
+    assert o.fingerprint() == c.fingerprint()
+    o['number'] = 6
+    nested = o.overlay()
+    assert nested.fingerprint() == o.fingerprint() != c.fingerprint()
+    nested['number'] = 5
+    assert nested.fingerprint() == c.fingerprint()
+
+
+def test_missing_section():
+    o = Config().overlay()
+    with raises(exceptions.NoSectionError) as e:
+        o.update({'sections': {'cat': {}}}, ignore_missing_sections=False)
+    assert str(e.value).startswith('No section named cat on section ')
+    o.update({'sections': {'cat': {}}})
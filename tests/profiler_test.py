@@ -0,0 +1,68 @@
+"""Test profiling option access."""
+
+from pytest import raises
+from simpleconf2 import Section, Option, validators
+from simpleconf2.compiler import compile_section
+from simpleconf2.profiler import Profiler
+
+
+class Config(Section):
+    name = Option('test')
+    number = Option(5, validator=validators.Integer)
+    unused = Option(None)
+
+    class dog(Section):
+        name = Option('Fido')
+
+    class cat(Section):
+        name = Option('Tiddles')
+
+    class hidden(Section):
+        secret = Option('')
+
+
+def test_profiler():
+    c = Config()
+    other = Config()
+    getattribute = Section.__getattribute__
+    with Profiler() as profiler:
+        with raises(RuntimeError):
+            Profiler().start()
+        for x in range(3):
+            c['name']
+        c.get('number')
+        c['number'] = 6
+        c.name.value
+        c.dog['name']
+        other['unused']  # A different tree.
+        c.update({'sections': {'cat': {'options': {'name': 'Felix'}}}})
+        c.cat.as_dictionary()
+    assert Section.__getattribute__ is getattribute
+    c['unused']  # Not profiling any more.
+    report = profiler.report(c)
+    assert report.options['name'] == (4, 0)
+    assert report.options['number'] == (1, 1)
+    assert report.hot(2) == [('name', 4, 0), ('number', 1, 1)]
+    assert report.cold(1) == [('dog.name', 1, 0)]
+    assert report.untouched() == ['cat.name', 'hidden.secret', 'unused']
+    assert report.sections == {'dog': 2, 'cat': 1, 'hidden': 0}
+    assert report.untouched_sections() == ['hidden']
+    assert not c._sections.is_loaded('hidden')
+    text = report.format()
+    assert 'Untouched sections:\n  hidden' in text
+    c.restore()
+
+
+def test_compiled():
+    # Enough options that updating one takes the sparse path, which calls
+    # Option.set from the compiled method.
+    options = {'extra%d' % x: Option(x) for x in range(5)}
+    Compiled = compile_section(type('Compiled', (Config,), options))
+    c = Compiled()
+    with Profiler() as profiler:
+        c.update({'options': {'name': 'changed'}})
+        c.as_dictionary()
+        c.restore()
+    report = profiler.report(c)
+    assert report.hot() == []
+    assert report.untouched_sections() == ['cat', 'dog', 'hidden']
@@ -0,0 +1,23 @@
+"""Test the control registry."""
+
+from pytest import raises
+from simpleconf2 import Option, validators
+from simpleconf2.dialogs.registry import ControlRegistry
+
+
+def test_resolve():
+    r = ControlRegistry()
+    assert r.resolve(Option(1)) is None
+    r.register(int, type=int)
+    r.register(bool, type=bool)
+    assert r.resolve(Option(True)) is bool
+    assert r.resolve(Option(5)) is int
+    assert r.resolve(Option(False)) is bool
+    r.register(str, validator=validators.String)
+    assert r.resolve(Option(5)) is str  # The default validator is String.
+    assert r.resolve(
+        Option(5, validator=validators.RestrictedString)
+    ) is str  # A subclass of String.
+    assert r.resolve(Option(5, validator=validators.Integer)) is int
+    with raises(TypeError):
+        r.register(float)
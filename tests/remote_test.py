@@ -0,0 +1,73 @@
+"""Test loading sections over HTTP."""
+
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pytest import raises
+from simpleconf2 import Section, Option, exceptions
+from simpleconf2.remote import RemoteFilename
+
+body = b'{"options": {"name": "Remote"}}'
+requests = []
+connections = set()
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep connections alive.
+
+    def do_GET(self):
+        requests.append(dict(self.headers))
+        connections.add(self.client_address)
+        if self.headers.get('If-None-Match') == '"1"':
+            self.send_response(304)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+        else:
+            self.send_response(200)
+            self.send_header('ETag', '"1"')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class Config(Section):
+    name = Option('test')
+
+
+def test_remote(tmp_path):
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = 'http://127.0.0.1:%d/config.json' % server.server_port
+    name = str(tmp_path / 'config.json')
+    f = RemoteFilename(name, url=url)
+    try:
+        c = Config(filename=f)
+        assert c['name'] == 'Remote'
+        assert len(requests) == 1
+        assert 'If-None-Match' not in requests[0]
+        c['name'] = 'test'
+        c.load()
+        assert c['name'] == 'Remote'
+        assert requests[-1]['If-None-Match'] == '"1"'  # Got a 304.
+        assert len(requests) == 2
+        assert len(connections) == 1  # The connection was reused.
+        f.max_age = 60
+        c.load()
+        assert len(requests) == 2  # The local copy was fresh enough.
+        c['name'] = 'Changed'
+        with raises(exceptions.ReadOnlyError) as e:
+            c.write()
+        assert str(e.value) == '%s is read only.' % url
+    finally:
+        server.shutdown()
+        server.server_close()
+    f.close()
+    f.max_age = 0
+    c.load()  # The server has gone, so the local copy is used.
+    assert isinstance(f.error, OSError)
+    assert c['name'] == 'Remote'
+    missing = RemoteFilename(str(tmp_path / 'missing.json'), url=url)
+    with raises(OSError):
+        Config(filename=missing)
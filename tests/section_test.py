@@ -128,3 +128,290 @@ def test_add_option():
     c.add_option('include', o, include=True)
     assert o in c.option_order
     assert c.include is o
+
+
+def test_lazy_sections():
+    class Config(Section):
+        class first(Section):
+            value = Option(1, validator=validators.Integer)
+
+        class second(Section):
+            value = Option(2, validator=validators.Integer)
+
+    c = Config()
+    assert Config.first.__name__ == 'first'
+    assert list(c.sections) == ['first', 'second']
+    assert not c._sections.is_loaded('first')
+    c.update(
+        {
+            'sections': {
+                'first': {'options': {'value': 3}},
+                'second': {'options': {'value': 4}}
+            }
+        }
+    )
+    assert not c._sections.is_loaded('first')
+    assert c.as_dictionary() == {
+        'sections': {
+            'first': {'options': {'value': 3}},
+            'second': {'options': {'value': 4}}
+        }
+    }
+    assert not c._sections.is_loaded('second')
+    assert c.first['value'] == 3
+    assert c._sections.is_loaded('first')
+    assert c.first.parent is c
+    assert not c._sections.is_loaded('second')
+    assert c._sections['second']['value'] == 4
+    assert c.second is c._sections['second']
+    c.restore()
+    assert c.first['value'] == 1
+
+
+def test_shards(tmp_path):
+    class Config(Section):
+        filename = str(tmp_path / 'config.json')
+        shard_directory = str(tmp_path)
+        value = Option('root')
+
+        class first(Section):
+            value = Option('first')
+
+        class second(Section):
+            value = Option('second')
+
+    c = Config()
+    c['value'] = 'changed root'
+    c.first['value'] = 'changed first'
+    c.write()
+    assert os.path.isfile(tmp_path / 'config.json')
+    assert os.path.isfile(tmp_path / 'first.json')
+    assert not os.path.isfile(tmp_path / 'second.json')
+    assert c.as_dictionary(shards=False) == {
+        'options': {'value': 'changed root'}
+    }
+    assert 'first' in c.as_dictionary()['sections']
+    c.restore()
+    c.load()
+    assert c['value'] == 'changed root'
+    assert c.first['value'] == 'changed first'
+    os.remove(tmp_path / 'first.json')
+    c.write()  # Nothing has changed in first.
+    assert not os.path.isfile(tmp_path / 'first.json')
+    c.second['value'] = 'changed second'
+    c.write()
+    assert not os.path.isfile(tmp_path / 'first.json')
+    assert os.path.isfile(tmp_path / 'second.json')
+    c = Config()
+    assert not c._sections.is_loaded('second')
+    assert c.second['value'] == 'changed second'
+
+
+def positive(option):
+    if option.value < 0:
+        return 'Must be positive.'
+
+
+def test_parallel_validate():
+    from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+    class Config(Section):
+        first = Option(1, validator=validators.QuickValidator(func=positive))
+        second = Option(-1, validator=validators.QuickValidator(func=positive))
+        third = Option(-1.0, validator=validators.Float(min=0.0))
+
+    c = Config()
+    expected = c.validate()
+    assert list(expected) == ['second', 'third']
+    for cls in (ThreadPoolExecutor, ProcessPoolExecutor):
+        with cls(max_workers=2) as executor:
+            errors = c.validate(executor=executor)
+            assert errors == expected
+            assert list(errors) == list(expected)
+
+
+def test_walk():
+    class Config(Section):
+        name = Option('test')
+        number = Option(1, validator=validators.Integer)
+
+        class hidden(Section):
+            visible = False
+            secret = Option('secret')
+
+            class nested(Section):
+                count = Option(2, validator=validators.Integer)
+
+    c = Config()
+    assert [path for path, option in c.walk(visible=True)] == [
+        'name', 'number'
+    ]
+    assert not c._sections.is_loaded('hidden')
+    assert [path for path, option in c.walk()] == [
+        'name', 'number', 'hidden.secret', 'hidden.nested.count'
+    ]
+    assert c._sections.is_loaded('hidden')
+    assert list(c.iter_sections()) == [c, c.hidden, c.hidden.nested]
+    assert list(c.iter_sections(visible=False)) == [c.hidden, c.hidden.nested]
+    assert list(c.iter_sections(visible=True)) == [c]
+    assert [o.name for o in c.iter_options(visible=True)] == [
+        'name', 'number'
+    ]
+    assert list(c.hidden.nested.iter_sections(visible=True)) == []
+    assert list(c.iter_options(validator=validators.Integer)) == [
+        c.number, c.hidden.nested.count
+    ]
+    assert dict(c.hidden.walk(prefix='hidden.')) == {
+        'hidden.secret': c.hidden.secret,
+        'hidden.nested.count': c.hidden.nested.count
+    }
+
+
+def test_skip_unchanged(tmp_path):
+    class Config(Section):
+        canonical = True
+        name = Option('test')
+
+        class dog(Section):
+            name = Option('Fido')
+
+    filename = str(tmp_path / 'config.json')
+    c = Config(filename=filename)
+    c['name'] = 'changed'
+    c.dog['name'] = 'Rex'
+    assert c.write() is True
+    with open(filename) as f:
+        assert f.read() == (
+            '{"options":{"name":"changed"},'
+            '"sections":{"dog":{"options":{"name":"Rex"}}}}'
+        )
+    mtime = os.stat(filename).st_mtime_ns
+    assert c.write() is False
+    assert os.stat(filename).st_mtime_ns == mtime
+    c = Config(filename=filename)  # Loading remembers the contents too.
+    assert c.write() is False
+    with open(filename, 'w') as f:
+        f.write('{}')  # Changed by someone else.
+    assert c.write() is True
+    c['name'] = 'test'
+    assert c.write() is True
+    mtime = os.stat(filename).st_mtime_ns
+    other = Config(filename=filename)
+    other.dog['name'] = 'Max'  # The same size as before.
+    other.write()
+    os.utime(filename, ns=(mtime, mtime))  # In the same tick.
+    assert c.write() is True
+    assert Config(filename=filename).dog['name'] == 'Rex'
+
+
+def test_locking(tmp_path):
+    def make_config():
+        class Config(Section):
+            locking = True
+            name = Option('test')
+            number = Option(1, validator=validators.Integer)
+
+            class dog(Section):
+                name = Option('Fido')
+
+        return Config(filename=str(tmp_path / 'config.json'))
+
+    a = make_config()
+    a['number'] = 2
+    a.write()
+    b = make_config()
+    assert b['number'] == 2
+    a['name'] = 'First'
+    a.dog['name'] = 'Rex'
+    a.write()
+    b['number'] = 1  # Back to the default.
+    b.dog['name'] = 'Spot'
+    assert b.write() is True
+    assert b['name'] == 'First'
+    assert b.as_dictionary() == {
+        'options': {'name': 'First'},
+        'sections': {'dog': {'options': {'name': 'Spot'}}}
+    }
+    assert make_config().as_dictionary() == b.as_dictionary()
+    a = make_config()
+    a['number'] = 3  # Same size as before, so probably the same fingerprint.
+    a.write()
+    b.write()
+    assert b['number'] == 3
+
+
+def test_mmap(tmp_path):
+    from simpleconf2.filename import Filename
+
+    class Config(Section):
+        name = Option('test')
+
+    name = str(tmp_path / 'config.json')
+    with open(name, 'w') as f:
+        f.write('{"options": {"name": "mapped"}}')
+    c = Config(filename=Filename(name, use_mmap=True))
+    assert c['name'] == 'mapped'
+    c['name'] = 'changed'
+    assert c.write() is True
+    c.load()
+    assert c['name'] == 'changed'
+
+
+def test_instances(tmp_path):
+    class Config(Section):
+        shard_directory = str(tmp_path)
+        value = Option('root')
+
+        class first(Section):
+            value = Option('first')
+
+    a = Config(filename=str(tmp_path / 'a.json'))
+    a.first
+    b = Config(filename=str(tmp_path / 'b.json'))
+    b.first
+    assert a.value is not b.value
+    assert a.option_order == [a.value]
+    a['value'] = 'changed'
+    assert b['value'] == 'root'
+    assert Config.value.value == 'root'
+    assert not b._dirty
+    a.first['value'] = 'changed'
+    assert a._dirty and a.first._dirty
+    assert not b.first._dirty
+    a.write()
+    assert Config(filename=str(tmp_path / 'a.json')).first[
+        'value'
+    ] == 'changed'
+
+
+def test_pending_data():
+    class Config(Section):
+        class first(Section):
+            value = Option(1, validator=validators.Integer)
+
+        class second(Section):
+            value = Option(2, validator=validators.Integer)
+
+    data = {
+        'sections': {
+            'first': {'options': {'value': 1, 'removed': 5}},
+            'second': {'options': {'value': 6}},
+            'removed': {'options': {'value': 7}}
+        }
+    }
+    expected = {'sections': {'second': {'options': {'value': 6}}}}
+    c = Config()
+    c.update(data)
+    assert c.as_dictionary() == expected
+    assert not c._sections.is_loaded('first')
+    c.first
+    c.second
+    assert c.as_dictionary() == expected
+
+
+def test_missing_section():
+    u = User()
+    with raises(exceptions.NoSectionError) as e:
+        u.update({'sections': {'cat': {}}}, ignore_missing_sections=False)
+    assert str(e.value).startswith('No section named cat on section ')
+    u.update({'sections': {'cat': {}}})
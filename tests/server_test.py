@@ -0,0 +1,58 @@
+"""Test sharing sections over a Unix socket."""
+
+from simpleconf2 import Section, Option, validators
+from simpleconf2.server import Server, Client
+
+
+def make_config():
+    class Config(Section):
+        name = Option('test')
+        number = Option(5, validator=validators.Integer)
+
+        class dog(Section):
+            name = Option('Fido')
+
+    return Config()
+
+
+def test_server(tmp_path):
+    path = str(tmp_path / 'config.sock')
+    config = make_config()
+    config['name'] = 'Server'
+    server = Server(config, path, keep=2).start()
+    changes = []
+    client = Client(
+        path, make_config(),
+        on_change=lambda changed, removed: changes.append((changed, removed))
+    ).connect()
+    try:
+        assert client.wait(1, timeout=5)
+        assert client.section['name'] == 'Server'
+        assert changes == [({'name': 'Server'}, [])]
+        assert server.update({'options': {'number': 6}})
+        assert client.wait(2, timeout=5)
+        assert client.section['number'] == 6
+        config['number'] = 5
+        config.dog['name'] = 'Rex'
+        assert server.publish()
+        assert not server.publish()  # Nothing has changed.
+        assert client.wait(3, timeout=5)
+        assert changes[-1] == ({'dog.name': 'Rex'}, ['number'])
+        assert client.section.as_dictionary() == config.as_dictionary()
+        client.close()
+        assert not client.connected
+        server.update({'options': {'name': 'Changed'}})
+        server.update({'options': {'name': 'Server'}})
+        client.connect()  # Only the changes since version 3 are sent.
+        assert client.wait(5, timeout=5)
+        assert changes[-1] == ({'name': 'Server'}, [])
+        client.close()
+        for x in range(3):
+            server.update({'options': {'number': x}})
+        client.connect()  # Too old for the server to remember.
+        assert client.wait(8, timeout=5)
+        assert changes[-1] == ({'number': 2}, [])
+        assert client.section.as_dictionary() == config.as_dictionary()
+    finally:
+        client.close()
+        server.stop()
@@ -0,0 +1,68 @@
+"""Test the SQLite backend."""
+
+import sqlite3
+from simpleconf2 import Section, Option
+from simpleconf2.sqlite import SQLiteFilename
+from simpleconf2.utils import flatten, expand
+
+
+class Config(Section):
+    name = Option('test')
+    age = Option(18)
+
+    class dog(Section):
+        name = Option('Fido')
+
+
+def test_flatten():
+    data = {
+        'options': {'name': 'Joe'},
+        'sections': {'dog': {'options': {'name': 'Rex'}}}
+    }
+    flat = flatten(data)
+    assert flat == {'name': 'Joe', 'dog.name': 'Rex'}
+    assert expand(flat) == data
+    assert expand(flatten(data, prefix='x.'), prefix='x.') == data
+
+
+def test_sqlite(tmp_path):
+    name = str(tmp_path / 'config.db')
+    c = Config(filename=SQLiteFilename(name))
+    c['name'] = 'Joe'
+    c.dog['name'] = 'Rex'
+    c.write()
+    db = sqlite3.connect(name)
+    assert db.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+    assert dict(db.execute('SELECT path, value FROM options')) == {
+        'name': '"Joe"', 'dog.name': '"Rex"'
+    }
+    assert c.filename.write(c.as_dictionary()) == 0  # Nothing changed.
+    c['age'] = 19
+    c.dog.restore()
+    assert c.filename.write(c.as_dictionary()) == 2
+    assert dict(db.execute('SELECT path, value FROM options')) == {
+        'name': '"Joe"', 'age': '19'
+    }
+    c.restore()
+    c.load()
+    assert c['name'] == 'Joe'
+    assert c['age'] == 19
+    c.filename.close()
+    db.close()
+
+
+def test_prefix(tmp_path):
+    name = str(tmp_path / 'config.db')
+    c = Config(filename=SQLiteFilename(name))
+    c['name'] = 'Joe'
+    c.write()
+    dog = Config.dog(filename=SQLiteFilename(name, prefix='dog.'))
+    dog['name'] = 'Rex'
+    dog.write()
+    c.restore()
+    c.load()
+    assert c['name'] == 'Joe'
+    assert c.dog['name'] == 'Rex'
+    assert c.filename.read(prefix='dog.') == {'options': {'name': 'Rex'}}
+    c.filename.close()
+    dog.filename.close()
@@ -22,3 +22,95 @@ def test_validators():
             except Exception:
                 warn('Exception found in method test of %r.' % validator)
                 raise
+
+
+def test_memoize():
+    calls = []
+
+    def func(option):
+        calls.append(option.value)
+        if option.value < 0:
+            return 'Negative.'
+
+    now = [0.0]
+    validator = validators.QuickValidator(func=func).memoize(size=2, ttl=10)
+    validator.cache.clock = lambda: now[0]
+    o = Option(1, validator=validator)
+    o.check()
+    o.check()
+    assert calls == [1]
+    o.value = True  # Equal to 1, but a different type.
+    o.check()
+    assert calls == [1, True]
+    o.value = -1
+    for x in range(2):
+        with validator.raises():
+            o.check()
+            raise AssertionError('Validation passed.')
+    assert calls == [1, True, -1]
+    o.value = 1  # Pushed out of the cache by -1.
+    o.check()
+    assert calls == [1, True, -1, 1]
+    now[0] = 20.0  # Expired.
+    o.check()
+    assert calls == [1, True, -1, 1, 1]
+    o.value = [1]  # Unhashable.
+    with validator.raises(TypeError):
+        o.check()
+    assert validator.cache.info() == (2, 5, 2, 2)
+
+
+def test_numeric_array():
+    from json import dumps, loads
+    from pytest import importorskip
+    from simpleconf2 import Section
+    numpy = importorskip('numpy')
+
+    class Config(Section):
+        weights = Option(
+            numpy.zeros(4), validator=validators.NumericArray(
+                shape=(4,), min=0.0, max=1.0
+            )
+        )
+
+    c = Config()
+    assert c.as_dictionary() == {}
+    c['weights'] = numpy.array([0.1, 0.2, 0.3, 0.4])
+    assert c.validate() == {}
+    data = loads(dumps(c.as_dictionary()))
+    c.restore()
+    assert c.as_dictionary() == {}
+    c.update(data)
+    assert numpy.array_equal(c['weights'], [0.1, 0.2, 0.3, 0.4])
+    c['weights'][0] = 2.0  # Loaded arrays are writable.
+    assert 'weights' in c.validate()
+    c.update({'options': {'weights': [1.0, 1.0, 1.0, 1.0]}})
+    assert c['weights'].dtype == numpy.float64
+    assert c.validate() == {}
+
+
+def test_plain():
+    from simpleconf2 import Section
+
+    class Upper(validators.String):
+        def serialise(self, value):
+            return value.upper()
+
+        def deserialise(self, value):
+            return value.lower()
+
+    assert validators.Validator.plain
+    assert validators.Integer.plain
+    assert not validators.NumericArray.plain
+    assert not Upper.plain
+
+    class Config(Section):
+        name = Option('test', validator=Upper)
+        number = Option(5, validator=validators.Integer)
+
+    c = Config()
+    c.update({'options': {'name': 'CHANGED', 'number': 6}})
+    assert c['name'] == 'changed'
+    assert c.as_dictionary() == {
+        'options': {'name': 'CHANGED', 'number': 6}
+    }
@@ -0,0 +1,99 @@
+"""Test the wx panels, using the stand-in from tests.fakewx."""
+
+import sys
+from importlib import import_module
+from pytest import fixture
+from tests import fakewx
+from simpleconf2 import Section, Option, validators
+
+
+class Lower(validators.String):
+    """A validator which lower-cases values read from a file."""
+
+    def deserialise(self, value):
+        return value.lower()
+
+
+# A control which sends none of SimpleConfWxPanel.change_events.
+Slider = type('Slider', (fakewx.Window,), {})
+
+
+class Config(Section):
+    name = Option('test', validator=validators.String)
+    code = Option('abc', validator=Lower)
+    number = Option(5, validator=validators.Integer(min=0))
+    level = Option(
+        1, validator=validators.Integer(max=10),
+        control=lambda option, window: Slider(window)
+    )
+
+
+@fixture
+def dialogs():
+    """Import simpleconf2.dialogs.wx with the fake wx installed, and put
+    sys.modules back afterwards."""
+    modules = dict(sys.modules)
+    for name in list(sys.modules):
+        if name == 'wx' or name.startswith(('wx.', 'simpleconf2.dialogs.wx')):
+            del sys.modules[name]
+    fakewx.install()
+    yield import_module('simpleconf2.dialogs.wx')
+    sys.modules.clear()
+    sys.modules.update(modules)
+
+
+def make_panel(dialogs):
+    """Return a panel for a new Config, which records error messages in
+    panel.errors."""
+    c = Config()
+    panel = dialogs.SimpleConfWxPanel(c, None)
+    panel.errors = []
+    panel.on_error = panel.errors.append
+    return c, panel
+
+
+def change(panel, name, value, event='EVT_TEXT'):
+    """Set the value of the control for name, and send event."""
+    control = panel.controls[name]
+    control.SetValue(value)
+    panel.handlers[event](fakewx.Event(id=control.GetId()))
+
+
+def test_on_ok(dialogs):
+    c, panel = make_panel(dialogs)
+    c['number'] = -1  # Invalid, but not changed in the panel.
+    change(panel, 'name', 'changed')
+    assert panel.get_changed() == [('name', c.name)]
+    assert panel.on_ok(None) is True
+    assert c['name'] == 'changed'
+    assert c['number'] == -1
+    assert panel.changed == {}
+
+
+def test_failure(dialogs):
+    c, panel = make_panel(dialogs)
+    change(panel, 'name', 'changed')
+    change(panel, 'number', -5, event='EVT_INT')
+    assert panel.on_ok(None) is False
+    assert len(panel.errors) == 1
+    assert c.as_dictionary() == {}
+
+
+def test_no_events(dialogs):
+    c, panel = make_panel(dialogs)
+    panel.controls['level'].SetValue(20)
+    panel.controls['number'].SetValue(5)  # The same as before.
+    assert panel.get_changed() == [('level', c.level)]
+    assert panel.on_ok(None) is False
+    assert c['level'] == 1
+    panel.controls['level'].SetValue(7)
+    assert panel.on_ok(None) is True
+    assert c['level'] == 7
+
+
+def test_no_deserialise(dialogs):
+    c, panel = make_panel(dialogs)
+    change(panel, 'code', 'XYZ')
+    assert panel.on_ok(None) is True
+    assert c['code'] == 'XYZ'
+    assert c.validate() == {}